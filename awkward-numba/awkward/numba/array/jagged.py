@@ -43,6 +43,12 @@ def _offsets2parents_fill(offsets, parents):
             j += 1
         k += 1
 
+@numba.njit(["void(i8[:], i8[:], i8[:])"])
+def _startsstops2parents_fill(starts, stops, parents):
+    for i in range(len(starts)):
+        for j in range(starts[i], stops[i]):
+            parents[j] = i
+
 @numba.njit(["void(i8[:], i8[:], f8[:], i8[:])",
              "void(i8[:], i8[:], f4[:], i8[:])",
              "void(i8[:], i8[:], i8[:], i8[:])"])
@@ -84,6 +90,13 @@ class JaggedArrayNumba(NumbaMethods, awkward.array.jagged.JaggedArray):
         _offsets2parents_fill(offsets, parents)
         return parents
 
+    @classmethod
+    def startsstops2parents(cls, starts, stops):
+        INDEXTYPE = cls.JaggedArray.fget(None).INDEXTYPE
+        parents = cls.numpy.full(stops.max(), -1, dtype=INDEXTYPE)
+        _startsstops2parents_fill(starts.astype(INDEXTYPE, copy=False), stops[:len(starts)].astype(INDEXTYPE, copy=False), parents)
+        return parents
+
     def _argminmax(self, ismin):
         if len(self._starts) == len(self._stops) == 0:
             return self.copy()
@@ -28,10 +28,191 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import operator
+
 import numba
+import numba.extending
+try:
+    from numba.core import cgutils
+    from numba.core.imputils import iternext_impl, RefType, impl_ret_new_ref
+except ImportError:
+    from numba import cgutils
+    from numba.targets.imputils import iternext_impl, RefType, impl_ret_new_ref
+
+import awkward.array.jagged
 
 class AwkwardType(numba.types.Type):
     pass
 
-class JaggedArrayType(AwkwardType):
-    pass
+################################################################ JaggedArray type
+
+def _arraytype(tpe):
+    # any-layout arrays so that sliced and unsliced JaggedArrays have the same Numba type
+    if isinstance(tpe, numba.types.Array):
+        return tpe.copy(layout="A")
+    else:
+        return tpe
+
+class JaggedArrayType(AwkwardType, numba.types.IterableType):
+    def __init__(self, startstpe, stopstpe, contenttpe, specialization=awkward.array.jagged.JaggedArray):
+        self.startstpe = _arraytype(startstpe)
+        self.stopstpe = _arraytype(stopstpe)
+        self.contenttpe = _arraytype(contenttpe)
+        self.specialization = specialization
+        super(JaggedArrayType, self).__init__(name="JaggedArrayType({0}, {1}, {2}, {3}.{4})".format(self.startstpe.name, self.stopstpe.name, self.contenttpe.name, specialization.__module__, specialization.__name__))
+
+    @property
+    def key(self):
+        return (self.startstpe, self.stopstpe, self.contenttpe, self.specialization)
+
+    @property
+    def iterator_type(self):
+        return JaggedArrayIteratorType(self)
+
+class JaggedArrayIteratorType(numba.types.common.SimpleIteratorType):
+    def __init__(self, arraytpe):
+        self.arraytpe = arraytpe
+        super(JaggedArrayIteratorType, self).__init__("iter({0})".format(arraytpe.name), arraytpe.contenttpe)
+
+@numba.extending.typeof_impl.register(awkward.array.jagged.JaggedArray)
+def _JaggedArray_typeof(val, c):
+    if len(val._starts.shape) != 1:
+        return None
+    val._valid()
+    return JaggedArrayType(numba.typeof(val._starts), numba.typeof(val.stops), numba.typeof(val._content), type(val))
+
+@numba.extending.register_model(JaggedArrayType)
+class JaggedArrayModel(numba.extending.models.StructModel):
+    def __init__(self, dmm, fe_type):
+        members = [("starts", fe_type.startstpe),
+                   ("stops", fe_type.stopstpe),
+                   ("content", fe_type.contenttpe)]
+        super(JaggedArrayModel, self).__init__(dmm, fe_type, members)
+
+@numba.extending.register_model(JaggedArrayIteratorType)
+class JaggedArrayIteratorModel(numba.extending.models.StructModel):
+    def __init__(self, dmm, fe_type):
+        members = [("array", fe_type.arraytpe),
+                   ("index", numba.types.EphemeralPointer(numba.intp))]
+        super(JaggedArrayIteratorModel, self).__init__(dmm, fe_type, members)
+
+numba.extending.make_attribute_wrapper(JaggedArrayType, "starts", "starts")
+numba.extending.make_attribute_wrapper(JaggedArrayType, "stops", "stops")
+numba.extending.make_attribute_wrapper(JaggedArrayType, "content", "content")
+
+################################################################ boxing and unboxing
+
+@numba.extending.unbox(JaggedArrayType)
+def _JaggedArray_unbox(typ, obj, c):
+    startsobj = c.pyapi.object_getattr_string(obj, "_starts")
+    stopsobj = c.pyapi.object_getattr_string(obj, "stops")
+    contentobj = c.pyapi.object_getattr_string(obj, "_content")
+
+    proxy = cgutils.create_struct_proxy(typ)(c.context, c.builder)
+    proxy.starts = c.pyapi.to_native_value(typ.startstpe, startsobj).value
+    proxy.stops = c.pyapi.to_native_value(typ.stopstpe, stopsobj).value
+    proxy.content = c.pyapi.to_native_value(typ.contenttpe, contentobj).value
+
+    c.pyapi.decref(startsobj)
+    c.pyapi.decref(stopsobj)
+    c.pyapi.decref(contentobj)
+
+    is_error = cgutils.is_not_null(c.builder, c.pyapi.err_occurred())
+    return numba.extending.NativeValue(proxy._getvalue(), is_error=is_error)
+
+@numba.extending.box(JaggedArrayType)
+def _JaggedArray_box(typ, val, c):
+    proxy = cgutils.create_struct_proxy(typ)(c.context, c.builder, value=val)
+    startsobj = c.pyapi.from_native_value(typ.startstpe, proxy.starts, c.env_manager)
+    stopsobj = c.pyapi.from_native_value(typ.stopstpe, proxy.stops, c.env_manager)
+    contentobj = c.pyapi.from_native_value(typ.contenttpe, proxy.content, c.env_manager)
+
+    clsobj = c.pyapi.unserialize(c.pyapi.serialize_object(typ.specialization))
+    out = c.pyapi.call_function_objargs(clsobj, (startsobj, stopsobj, contentobj))
+
+    c.pyapi.decref(clsobj)
+    c.pyapi.decref(startsobj)
+    c.pyapi.decref(stopsobj)
+    c.pyapi.decref(contentobj)
+    return out
+
+################################################################ construction, len, getitem
+
+@numba.extending.intrinsic
+def _JaggedArray_new(typingctx, arraytpe, startstpe, stopstpe, contenttpe):
+    tpe = JaggedArrayType(startstpe, stopstpe, contenttpe, arraytpe.specialization)
+
+    def codegen(context, builder, sig, args):
+        array, starts, stops, content = args
+        _, startstpe, stopstpe, contenttpe = sig.args
+
+        proxy = cgutils.create_struct_proxy(sig.return_type)(context, builder)
+        proxy.starts = context.cast(builder, starts, startstpe, sig.return_type.startstpe)
+        proxy.stops = context.cast(builder, stops, stopstpe, sig.return_type.stopstpe)
+        proxy.content = context.cast(builder, content, contenttpe, sig.return_type.contenttpe)
+
+        if context.enable_nrt:
+            context.nrt.incref(builder, sig.return_type.startstpe, proxy.starts)
+            context.nrt.incref(builder, sig.return_type.stopstpe, proxy.stops)
+            context.nrt.incref(builder, sig.return_type.contenttpe, proxy.content)
+
+        return impl_ret_new_ref(context, builder, sig.return_type, proxy._getvalue())
+
+    return tpe(arraytpe, startstpe, stopstpe, contenttpe), codegen
+
+@numba.extending.overload(len)
+def _JaggedArray_len(array):
+    if isinstance(array, JaggedArrayType):
+        def impl(array):
+            return len(array.starts)
+        return impl
+
+@numba.extending.overload(operator.getitem)
+def _JaggedArray_getitem(array, where):
+    if isinstance(array, JaggedArrayType):
+        if isinstance(where, numba.types.Integer):
+            def impl(array, where):
+                if where < 0:
+                    where += len(array.starts)
+                if where < 0 or where >= len(array.starts):
+                    raise IndexError("index out of bounds for JaggedArray")
+                return array.content[array.starts[where]:array.stops[where]]
+            return impl
+
+        elif isinstance(where, numba.types.SliceType):
+            def impl(array, where):
+                return _JaggedArray_new(array, array.starts[where], array.stops[where], array.content)
+            return impl
+
+################################################################ iteration
+
+@numba.extending.lower_builtin("getiter", JaggedArrayType)
+def _JaggedArray_getiter(context, builder, sig, args):
+    arraytpe, = sig.args
+    array, = args
+
+    iterobj = context.make_helper(builder, sig.return_type)
+    iterobj.array = array
+    iterobj.index = cgutils.alloca_once_value(builder, context.get_constant(numba.intp, 0))
+
+    if context.enable_nrt:
+        context.nrt.incref(builder, arraytpe, array)
+
+    return impl_ret_new_ref(context, builder, sig.return_type, iterobj._getvalue())
+
+@numba.extending.lower_builtin("iternext", JaggedArrayIteratorType)
+@iternext_impl(RefType.NEW)
+def _JaggedArray_iternext(context, builder, sig, args, result):
+    itertpe, = sig.args
+    iterobj = context.make_helper(builder, itertpe, value=args[0])
+
+    index = builder.load(iterobj.index)
+    length = context.compile_internal(builder, lambda array: len(array), numba.intp(itertpe.arraytpe), (iterobj.array,))
+
+    is_valid = builder.icmp_signed("<", index, length)
+    result.set_valid(is_valid)
+
+    with builder.if_then(is_valid, likely=True):
+        value = context.compile_internal(builder, lambda array, i: array[i], itertpe.yield_type(itertpe.arraytpe, numba.intp), (iterobj.array, index))
+        result.yield_(value)
+        builder.store(cgutils.increment_index(builder, index), iterobj.index)
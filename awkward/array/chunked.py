@@ -28,6 +28,8 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import collections
+
 import awkward.array.base
 import awkward.persist
 import awkward.type
@@ -38,6 +40,11 @@ class ChunkedArray(awkward.array.base.AwkwardArray):
     ChunkedArray
     """
 
+    # any object with an order-preserving map(fcn, iterable), such as
+    # concurrent.futures.ThreadPoolExecutor or multiprocessing.pool.ThreadPool;
+    # None evaluates chunks serially
+    executor = None
+
     def __init__(self, chunks, counts=[]):
         self.chunks = chunks
         self.counts = counts
@@ -299,6 +306,79 @@ class ChunkedArray(awkward.array.base.AwkwardArray):
             for x in chunk[:self._counts[i]]:
                 yield x
 
+    def iterchunks(self, columns=None, prefetch=0):
+        # streams chunks with their VirtualArrays materialized, loading the next `prefetch` chunks on
+        # background threads; the ChunkedArray keeps none of them, so memory is bounded by prefetch + 1 chunks
+        if isinstance(columns, awkward.util.string):
+            columns = [columns]
+
+        def keys(chunk):
+            if isinstance(chunk, self.Table):
+                arrays = chunk._contents.values()
+            else:
+                arrays = [chunk]
+            return [(x.cache, x.key) for x in arrays if isinstance(x, self.VirtualArray) and x.cache is not None and isinstance(x.key, awkward.util.string)]
+
+        def load(chunk, count):
+            # every key of the chunk (not only the projected columns) that appears while loading was put there by
+            # this load, including the sibling columns a reader may fetch along with the requested one
+            before = [(cache, key) for cache, key in keys(chunk) if key not in cache]
+
+            if columns is not None and isinstance(chunk, self.Table):
+                chunk = chunk[columns]
+
+            def materialize(x):
+                if isinstance(x, self.VirtualArray):
+                    return x.copy().array
+                else:
+                    return x
+
+            if isinstance(chunk, self.Table):
+                chunk = chunk.copy(contents=[(n, materialize(x)) for n, x in chunk._contents.items()])
+            else:
+                chunk = materialize(chunk)
+            return chunk[:count], [(cache, key) for cache, key in before if key in cache]
+
+        def release(evict):
+            for cache, key in evict:
+                try:
+                    del cache[key]
+                except KeyError:
+                    pass
+
+        if prefetch > 0:
+            import multiprocessing.pool
+            pool = multiprocessing.pool.ThreadPool(prefetch)
+        else:
+            pool = None
+
+        pending = collections.deque()
+        try:
+            for i in range(len(self._chunks) + prefetch):
+                if i < len(self._chunks):
+                    self.knowcounts(i + 1)
+                    if pool is None:
+                        pending.append(load(self._chunks[i], self._counts[i]))
+                    else:
+                        pending.append(pool.apply_async(load, (self._chunks[i], self._counts[i])))
+
+                if len(pending) > prefetch or (i >= len(self._chunks) and len(pending) > 0):
+                    chunk, evict = pending.popleft() if pool is None else pending.popleft().get()
+                    try:
+                        yield chunk
+                    finally:
+                        chunk = None
+                        release(evict)
+
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+                # the caller stopped early: drop what was loaded ahead
+                for x in pending:
+                    if x.successful():
+                        release(x.get()[1])
+
     def __array__(self, *args, **kwargs):
         self._checktonumpy()
 
@@ -560,9 +640,7 @@ class ChunkedArray(awkward.array.base.AwkwardArray):
         out = None
         chunks = {}
         types = {}
-        for batch in batches:
-            result = getattr(ufunc, method)(*batch, **kwargs)
-
+        for result in self._mapchunks(lambda batch: getattr(ufunc, method)(*batch, **kwargs), batches):
             if isinstance(result, tuple):
                 if out is None:
                     out = list(result)
@@ -602,34 +680,184 @@ class ChunkedArray(awkward.array.base.AwkwardArray):
         else:
             return False
 
-    def _reduce(self, ufunc, identity, dtype, regularaxis):
+    def _mapchunks(self, fcn, items, executor=None):
+        if executor is None:
+            executor = self.executor
+        if executor is None:
+            return [fcn(x) for x in items]
+        else:
+            return list(executor.map(fcn, items))
+
+    def any(self, regularaxis=None, executor=None):
+        return self._reduce(self.numpy.bitwise_or, False, self.BOOLTYPE, regularaxis, executor=executor)
+
+    def all(self, regularaxis=None, executor=None):
+        return self._reduce(self.numpy.bitwise_and, True, self.BOOLTYPE, regularaxis, executor=executor)
+
+    def count(self, regularaxis=None, executor=None):
+        return self._reduce(None, 0, None, regularaxis, executor=executor)
+
+    def count_nonzero(self, regularaxis=None, executor=None):
+        return self._reduce(self.numpy.count_nonzero, 0, None, regularaxis, executor=executor)
+
+    def sum(self, regularaxis=None, executor=None):
+        return self._reduce(self.numpy.add, 0, None, regularaxis, executor=executor)
+
+    def prod(self, regularaxis=None, executor=None):
+        return self._reduce(self.numpy.multiply, 1, None, regularaxis, executor=executor)
+
+    def min(self, regularaxis=None, executor=None):
+        return self._reduce(self.numpy.minimum, self.numpy.inf, None, regularaxis, executor=executor)
+
+    def max(self, regularaxis=None, executor=None):
+        return self._reduce(self.numpy.maximum, -self.numpy.inf, None, regularaxis, executor=executor)
+
+    def agg(self, aggregations, executor=None):
+        self.knowcounts()
+        self._valid()
+        if not self._util_hasjagged(self):
+            raise TypeError("agg computes per-sublist aggregations, which requires jagged chunks")
+        nonempty = [chunk[:self._counts[chunkid]] for chunkid, chunk in enumerate(self._chunks) if self._counts[chunkid] > 0]
+        chunks = self._mapchunks(lambda chunk: chunk.agg(aggregations), nonempty, executor)
+        return self.copy(chunks=chunks, counts=[len(x) for x in chunks])
+
+    def describe(self, executor=None):
+        return self.agg(["count", "mean", "std", "min", "max"], executor=executor)
+
+    def _statistic(self, weight, perchunk, partial, combine, finish, executor=None):
+        # perchunk(chunk, weight) for jagged chunks; otherwise partial(chunk, weight) results are combined pairwise like _reduce, then finished
         self.knowcounts()
         self._valid()
 
+        if weight is not None:
+            if not isinstance(weight, ChunkedArray):
+                raise TypeError("weight must be a ChunkedArray with the same chunk sizes as the array")
+            weight.knowcounts()
+            if weight._counts != self._counts:
+                raise ValueError("weight must have the same chunk sizes as the array")
+
+        items = [(chunk[:self._counts[chunkid]], None if weight is None else weight._chunks[chunkid][:self._counts[chunkid]]) for chunkid, chunk in enumerate(self._chunks) if self._counts[chunkid] > 0]
+
         if self._util_hasjagged(self):
-            chunks = []
-            for chunkid, chunk in enumerate(self._chunks):
-                this = chunk._reduce(ufunc, identity, dtype, regularaxis)
-                if len(this) > 0:
-                    chunks.append(this)
-            return self.copy(chunks=chunks)
+            chunks = self._mapchunks(lambda pair: perchunk(*pair), items, executor)
+            return self.copy(chunks=chunks, counts=[len(x) for x in chunks])
+
+        partials = self._mapchunks(lambda pair: partial(*pair), items, executor)
+        while len(partials) > 1:
+            pairs = [(partials[i], partials[i + 1]) for i in range(0, len(partials) - 1, 2)]
+            combined = self._mapchunks(lambda pair: combine(*pair), pairs, executor)
+            if len(partials) % 2 == 1:
+                combined.append(partials[-1])
+            partials = combined
+
+        with self.numpy.errstate(invalid="ignore", divide="ignore"):
+            return finish(partials[0] if len(partials) > 0 else None)
+
+    def _meanvar(self, ddof, which, weight, executor):
+        numpy = self.numpy
+
+        def partial(chunk, weight):
+            # (sum of weights, mean, sum of weighted squared deviations from the mean) of one chunk
+            chunk = numpy.asarray(chunk, dtype=numpy.result_type(chunk.dtype, numpy.float64))
+            if weight is None:
+                sumw = numpy.float64(len(chunk))
+                mean = chunk.sum(axis=0) / sumw
+                return sumw, mean, ((chunk - mean)**2).sum(axis=0)
+            else:
+                weight = numpy.asarray(weight).reshape((-1,) + (1,) * (len(chunk.shape) - 1))
+                sumw = weight.sum(axis=0)
+                with numpy.errstate(invalid="ignore", divide="ignore"):
+                    mean = (weight * chunk).sum(axis=0) / sumw
+                return sumw, mean, (weight * (chunk - mean)**2).sum(axis=0)
+
+        def combine(x, y):
+            # parallel update of Chan, Golub, and LeVeque
+            sumw = x[0] + y[0]
+            delta = y[1] - x[1]
+            with numpy.errstate(invalid="ignore", divide="ignore"):
+                return sumw, x[1] + delta * (y[0] / sumw), x[2] + y[2] + delta**2 * (x[0] * y[0] / sumw)
+
+        def finish(x):
+            if x is None:
+                return numpy.nan
+            elif which == "mean":
+                return x[1]
+            var = x[2] / (x[0] - ddof)
+            return numpy.sqrt(var) if which == "std" else var
+
+        def perchunk(chunk, weight):
+            if which == "mean":
+                return chunk.mean(weight=weight)
+            else:
+                return getattr(chunk, which)(weight=weight, ddof=ddof)
 
-        out = None
-        for chunkid, chunk in enumerate(self._chunks):
-            if self._counts[chunkid] > 0:
-                this = self._util_reduce(chunk[:self._counts[chunkid]], ufunc, identity, dtype, regularaxis)
-                if out is None:
-                    out = this
-                else:
-                    out = ufunc(out, this)
+        return self._statistic(weight, perchunk, partial, combine, finish, executor=executor)
 
-        if out is None:
+    def mean(self, weight=None, executor=None):
+        return self._meanvar(0, "mean", weight, executor)
+
+    def var(self, weight=None, ddof=0, executor=None):
+        return self._meanvar(ddof, "var", weight, executor)
+
+    def std(self, weight=None, ddof=0, executor=None):
+        return self._meanvar(ddof, "std", weight, executor)
+
+    def moment(self, n, weight=None, executor=None):
+        # raw moment about zero, sum(w * x**n) / sum(w); not about the mean, as scipy.stats.moment is
+        numpy = self.numpy
+        if not self._util_isinteger(n) or n < 0:
+            raise ValueError("n must be a non-negative integer")
+
+        def partial(chunk, weight):
+            chunk = numpy.asarray(chunk, dtype=numpy.result_type(chunk.dtype, numpy.float64))
+            if weight is None:
+                return numpy.float64(len(chunk)), (chunk**n).sum(axis=0)
+            else:
+                weight = numpy.asarray(weight).reshape((-1,) + (1,) * (len(chunk.shape) - 1))
+                return weight.sum(axis=0), (weight * chunk**n).sum(axis=0)
+
+        combine = lambda x, y: (x[0] + y[0], x[1] + y[1])
+        finish = lambda x: numpy.nan if x is None else x[1] / x[0]
+        return self._statistic(weight, lambda chunk, weight: chunk.moment(n, weight=weight), partial, combine, finish, executor=executor)
+
+    def quantile(self, q, executor=None):
+        numpy = self.numpy
+
+        # a quantile of the whole array needs all of it at once: collect the chunks and concatenate them only once
+        partial = lambda chunk, weight: [numpy.asarray(chunk)]
+        combine = lambda x, y: x + y
+        finish = lambda x: numpy.nan if x is None else numpy.percentile(numpy.concatenate(x), 100*q, axis=0)
+        return self._statistic(None, lambda chunk, weight: chunk.quantile(q), partial, combine, finish, executor=executor)
+
+    def median(self, executor=None):
+        return self.quantile(0.5, executor=executor)
+
+    def _reduce(self, ufunc, identity, dtype, regularaxis, executor=None):
+        self.knowcounts()
+        self._valid()
+
+        if self._util_hasjagged(self):
+            chunks = self._mapchunks(lambda chunk: chunk._reduce(ufunc, identity, dtype, regularaxis), self._chunks, executor)
+            return self.copy(chunks=[x for x in chunks if len(x) > 0])
+
+        nonempty = [chunk[:self._counts[chunkid]] for chunkid, chunk in enumerate(self._chunks) if self._counts[chunkid] > 0]
+        partials = self._mapchunks(lambda chunk: self._util_reduce(chunk, ufunc, identity, dtype, regularaxis), nonempty, executor)
+
+        # combine pairwise, so that the result does not depend on whether the partials were computed in parallel
+        while len(partials) > 1:
+            pairs = [(partials[i], partials[i + 1]) for i in range(0, len(partials) - 1, 2)]
+            combined = self._mapchunks(lambda pair: ufunc(*pair), pairs, executor)
+            if len(partials) % 2 == 1:
+                combined.append(partials[-1])
+            partials = combined
+
+        if len(partials) == 0:
             if dtype is None:
                 return identity
             else:
                 return dtype.type(identity)
         else:
-            return out
+            return partials[0]
 
     def _prepare(self, identity, dtype):
         self.knowcounts()
@@ -28,8 +28,8 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import math
 import numbers
+import operator
 import os
 from collections import OrderedDict
 try:
@@ -74,12 +74,47 @@ class JaggedArray(awkward.array.base.AwkwardArrayWithContent):
 
     @classmethod
     def startsstops2parents(cls, starts, stops):
-        out = cls.numpy.full(stops.max(), -1, dtype=cls.JaggedArray.fget(None).INDEXTYPE)
-        lenstarts = len(starts)
-        i = 0
-        while i < lenstarts:
-            out[starts[i]:stops[i]] = i
-            i += 1
+        INDEXTYPE = cls.JaggedArray.fget(None).INDEXTYPE
+        out = cls.numpy.full(stops.max(), -1, dtype=INDEXTYPE)
+
+        # empty (or inverted) ranges don't claim any content
+        which = cls.numpy.nonzero(starts < stops[:len(starts)])[0]
+        if len(which) == 0:
+            return out
+        nonemptystarts = starts[which]
+        nonemptystops = stops[which]
+
+        if (nonemptystarts[1:] >= nonemptystops[:-1]).all():
+            coverage = None
+        else:
+            # how many ranges cover each element, from +1 at every start and -1 at every stop: linear, in any order
+            coverage = cls.numpy.bincount(nonemptystarts, minlength=len(out) + 1)[:len(out) + 1]
+            coverage -= cls.numpy.bincount(nonemptystops, minlength=len(out) + 1)[:len(out) + 1]
+            cls.numpy.cumsum(coverage, out=coverage)
+
+        if coverage is None or (coverage <= 1).all():
+            # disjoint ranges (in any order): step up to parent + 1 at each start, back down at each stop
+            if coverage is None:
+                delta = cls.numpy.zeros(len(out) + 1, dtype=INDEXTYPE)
+            else:
+                delta = coverage
+                delta[:] = 0
+            delta[nonemptystarts] = which + 1
+            delta[nonemptystops] -= which + 1
+            cls.numpy.cumsum(delta[:-1], out=out)
+            out -= 1
+
+        else:
+            # overlapping ranges: the last range to claim an element wins, as in out[start:stop] = i;
+            # the (element, range) pairs are generated in range order and a one-dimensional integer-indexed
+            # assignment is applied in order, so the last write to each element is from the last range
+            counts = nonemptystops - nonemptystarts
+            offsets = cls.counts2offsets(counts)
+            local = cls.numpy.arange(offsets[-1], dtype=INDEXTYPE)
+            local -= cls.numpy.repeat(offsets[:-1], counts)
+            local += cls.numpy.repeat(nonemptystarts, counts)
+            out[local] = cls.numpy.repeat(which, counts)
+
         return out
 
     @classmethod
@@ -604,75 +639,75 @@ class JaggedArray(awkward.array.base.AwkwardArrayWithContent):
                     node = type(self).fromcounts(oldcounts, node)
 
             elif isinstance(head, slice):
+                stack = []
+                for x in range(nslices):
+                    stack.insert(0, node.counts)
+                    node = node.flatten()
                 nslices += 1
-                if nslices >= 2:
-                    raise NotImplementedError("this implementation cannot slice a JaggedArray in more than two dimensions")
 
-                counts = node.stops - node._starts
                 step = 1 if head.step is None else head.step
-
                 if step == 0:
                     raise ValueError("slice step cannot be zero")
 
-                elif step > 0:
-                    if head.start is None:
-                        starts = self.numpy.zeros(counts.shape, dtype=self.INDEXTYPE)
-                    elif head.start >= 0:
-                        starts = self.numpy.minimum(counts, head.start)
-                    else:
-                        starts = self.numpy.maximum(0, self.numpy.minimum(counts, counts + head.start))
-
-                    if head.stop is None:
-                        stops = counts
-                    elif head.stop >= 0:
-                        stops = self.numpy.minimum(counts, head.stop)
-                    else:
-                        stops = self.numpy.maximum(0, self.numpy.minimum(counts, counts + head.stop))
+                if not isinstance(node, JaggedArray):
+                    node = node[:, head]
 
-                    stops = self.numpy.maximum(starts, stops)
+                else:
+                    # per-subarray start and length of the slice, as in Python's slice.indices
+                    counts = node.stops - node._starts
+
+                    if step > 0:
+                        if head.start is None:
+                            starts = self.numpy.zeros(counts.shape, dtype=self.INDEXTYPE)
+                        elif head.start >= 0:
+                            starts = self.numpy.minimum(counts, head.start)
+                        else:
+                            starts = self.numpy.maximum(0, self.numpy.minimum(counts, counts + head.start))
 
-                    start = starts.min()
-                    stop = stops.max()
-                    indexes = self.numpy.empty((len(node), abs(stop - start)), dtype=self.INDEXTYPE)
-                    indexes[:, :] = self.numpy.arange(start, stop)
+                        if head.stop is None:
+                            stops = counts
+                        elif head.stop >= 0:
+                            stops = self.numpy.minimum(counts, head.stop)
+                        else:
+                            stops = self.numpy.maximum(0, self.numpy.minimum(counts, counts + head.stop))
 
-                    mask = indexes >= starts.reshape((len(node), 1))
-                    self.numpy.bitwise_and(mask, indexes < stops.reshape((len(node), 1)), out=mask)
-                    if step != 1:
-                        self.numpy.bitwise_and(mask, self.numpy.remainder(indexes - starts.reshape((len(node), 1)), step) == 0, out=mask)
+                        newcounts = self.numpy.maximum(0, stops - starts + (step - 1)) // step
 
-                else:
-                    if head.start is None:
-                        starts = counts - 1
-                    elif head.start >= 0:
-                        starts = self.numpy.minimum(counts - 1, head.start)
                     else:
-                        starts = self.numpy.maximum(-1, self.numpy.minimum(counts - 1, counts + head.start))
-                    
-                    if head.stop is None:
-                        stops = self.numpy.full(counts.shape, -1, dtype=self.INDEXTYPE)
-                    elif head.stop >= 0:
-                        stops = self.numpy.minimum(counts - 1, head.stop)
-                    else:
-                        stops = self.numpy.maximum(-1, self.numpy.minimum(counts - 1, counts + head.stop))
+                        if head.start is None:
+                            starts = counts - 1
+                        elif head.start >= 0:
+                            starts = self.numpy.minimum(counts - 1, head.start)
+                        else:
+                            starts = self.numpy.maximum(-1, self.numpy.minimum(counts - 1, counts + head.start))
 
-                    stops = self.numpy.minimum(starts, stops)
+                        if head.stop is None:
+                            stops = self.numpy.full(counts.shape, -1, dtype=self.INDEXTYPE)
+                        elif head.stop >= 0:
+                            stops = self.numpy.minimum(counts - 1, head.stop)
+                        else:
+                            stops = self.numpy.maximum(-1, self.numpy.minimum(counts - 1, counts + head.stop))
 
-                    start = starts.max()
-                    stop = stops.min()
-                    indexes = self.numpy.empty((len(node), abs(stop - start)), dtype=self.INDEXTYPE)
-                    indexes[:, :] = self.numpy.arange(start, stop, -1)
+                        newcounts = self.numpy.maximum(0, starts - stops + (-step - 1)) // -step
 
-                    mask = indexes <= starts.reshape((len(node), 1))
-                    self.numpy.bitwise_and(mask, indexes > stops.reshape((len(node), 1)), out=mask)
-                    if step != -1:
-                        self.numpy.bitwise_and(mask, self.numpy.remainder(indexes - starts.reshape((len(node), 1)), step) == 0, out=mask)
+                    starts = starts + node._starts
 
-                newcounts = self.numpy.count_nonzero(mask, axis=1)
-                newoffsets = self.counts2offsets(newcounts.reshape(-1))
-                newcontent = node._content[(indexes + node._starts.reshape((len(node), 1)))[mask]]
+                    if step == 1:
+                        # contiguous in each subarray: share the content, only starts and stops are new
+                        node = node.copy(starts=starts, stops=starts + newcounts)
 
-                node = node.copy(starts=newoffsets[:-1], stops=newoffsets[1:], content=newcontent)
+                    else:
+                        # gather only the selected elements: memory scales with the output, not the widest subarray
+                        newoffsets = self.counts2offsets(newcounts.reshape(-1))
+                        parents = self.offsets2parents(newoffsets)
+                        index = self.numpy.arange(newoffsets[-1], dtype=self.INDEXTYPE)
+                        index -= newoffsets[parents]
+                        index *= step
+                        index += starts.reshape(-1)[parents]
+                        node = node.copy(starts=newoffsets[:-1].reshape(counts.shape), stops=newoffsets[1:].reshape(counts.shape), content=node._content[index])
+
+                for oldcounts in stack:
+                    node = type(self).fromcounts(oldcounts, node)
 
             else:
                 head = self.numpy.array(head, copy=False)
@@ -997,6 +1032,21 @@ class JaggedArray(awkward.array.base.AwkwardArrayWithContent):
             indexes += self.numpy.arange(count)
             return self._content[indexes]
 
+    def _gathered(self, content, index):
+        # a combination repeats each element many times; rather than gathering every column of a Table up front,
+        # each column is a VirtualArray that gathers on first access and keeps the result
+        if not isinstance(content, self.Table) or content.istuple:
+            return content[index]
+
+        view = content[index]
+        index = view._index()
+        out = view.copy(contents=[])
+        out._view = None
+        out._base = None
+        for n, x in view._contents.items():
+            out[n] = self.VirtualArray(operator.getitem, (x, index), type=awkward.type.ArrayType(len(index), awkward.type.fromarray(x).to), persistvirtual=False)
+        return out
+
     def _argpairs(self):
         self._valid()
         
@@ -1068,7 +1118,7 @@ class JaggedArray(awkward.array.base.AwkwardArrayWithContent):
         left = argpairs._content["0"]
         right = argpairs._content["1"]
 
-        out = self.JaggedArray.fromoffsets(argpairs.offsets, self.Table.named("tuple", self._content[left], self._content[right]).flattentuple())
+        out = self.JaggedArray.fromoffsets(argpairs.offsets, self.Table.named("tuple", self._gathered(self._content, left), self._gathered(self._content, right)).flattentuple())
         out._parents = argpairs._parents
 
         if nested:
@@ -1091,7 +1141,7 @@ class JaggedArray(awkward.array.base.AwkwardArrayWithContent):
         left = argpairs._content["0"]
         right = argpairs._content["1"]
 
-        out = self.JaggedArray.fromoffsets(argpairs.offsets, self.Table.named("tuple", self._content[left], self._content[right]).flattentuple())
+        out = self.JaggedArray.fromoffsets(argpairs.offsets, self.Table.named("tuple", self._gathered(self._content, left), self._gathered(self._content, right)).flattentuple())
         out._parents = argpairs._parents
 
         if nested:
@@ -1099,6 +1149,76 @@ class JaggedArray(awkward.array.base.AwkwardArrayWithContent):
 
         return out
 
+    def _expandcombinations(self, parents, columns, extend, start):
+        # one more index per combination: each partial combination i repeats extend[i] times, counting up from start[i]
+        # (exact integer arithmetic; every partial completes, so no intermediate is larger than the final output)
+        offsets = self.counts2offsets(extend)
+        which = self.offsets2parents(offsets)
+        new = start[which] + (self.numpy.arange(offsets[-1], dtype=self.INDEXTYPE) - offsets[:-1][which])
+        return parents[which], [x[which] for x in columns] + [new]
+
+    def _argchoose(self, k, replacement):
+        self._valid()
+        if not self._util_isinteger(k) or k < 1:
+            raise ValueError("k must be a positive integer")
+
+        # lexicographic order: i0 < i1 < ... (or <= with replacement); without replacement, index j is at most n - k + j
+        counts = self.counts.reshape(-1)
+        if replacement:
+            first = counts
+        else:
+            first = self.numpy.maximum(counts - k + 1, 0)
+        offsets = self.counts2offsets(first)
+        parents = self.offsets2parents(offsets)
+        columns = [self.numpy.arange(offsets[-1], dtype=self.INDEXTYPE) - offsets[:-1][parents]]
+
+        for j in range(1, k):
+            last = columns[-1]
+            if replacement:
+                parents, columns = self._expandcombinations(parents, columns, counts[parents] - last, last)
+            else:
+                parents, columns = self._expandcombinations(parents, columns, counts[parents] - k + j - last, last + 1)
+
+        return self.counts2offsets(self._bincount(parents, len(counts))), parents, columns
+
+    def argchoose(self, k, replacement=False):
+        offsets, parents, columns = self._argchoose(k, replacement)
+        out = self.JaggedArray.fromoffsets(offsets, self.Table.named("tuple", *columns))
+        out._parents = parents
+        return out
+
+    def choose(self, k, replacement=False):
+        offsets, parents, columns = self._argchoose(k, replacement)
+        starts = self._starts.reshape(-1)[parents]
+        out = self.JaggedArray.fromoffsets(offsets, self.Table.named("tuple", *[self._gathered(self._content, starts + x) for x in columns]).flattentuple())
+        out._parents = parents
+        return out
+
+    def _argcrossn(self, others):
+        # n-ary cross product of this and each of others, as local indexes, in row-major order
+        self._valid()
+        arrays = [self] + list(others)
+        for x in arrays:
+            if not isinstance(x, JaggedArray):
+                raise TypeError("all arrays must be JaggedArrays")
+            if len(x) != len(self):
+                raise ValueError("all JaggedArrays must have the same length")
+
+        countss = [x.counts.reshape(-1) for x in arrays]
+        total = countss[0]
+        for counts in countss[1:]:
+            total = total * counts
+
+        first = self.numpy.where(total > 0, countss[0], 0)
+        offsets = self.counts2offsets(first)
+        parents = self.offsets2parents(offsets)
+        columns = [self.numpy.arange(offsets[-1], dtype=self.INDEXTYPE) - offsets[:-1][parents]]
+        zero = self.numpy.zeros(len(self), dtype=self.INDEXTYPE)
+        for counts in countss[1:]:
+            parents, columns = self._expandcombinations(parents, columns, counts[parents], zero[parents])
+
+        return arrays, self.counts2offsets(total), parents, columns
+
     def _argcross(self, other):
         self._valid()
 
@@ -1124,6 +1244,14 @@ class JaggedArray(awkward.array.base.AwkwardArrayWithContent):
         return out
 
     def argcross(self, other, nested=False):
+        if isinstance(other, (list, tuple)):
+            if nested:
+                raise NotImplementedError("nested=True is only supported for the cross product of two arrays")
+            arrays, offsets, parents, columns = self._argcrossn(other)
+            out = self.JaggedArray.fromoffsets(offsets, self.Table.named("tuple", *columns))
+            out._parents = parents
+            return out
+
         out = self._argcross(other)
         out["0"] = out["0"] - self._starts
         out["1"] = out["1"] - other._starts
@@ -1134,6 +1262,14 @@ class JaggedArray(awkward.array.base.AwkwardArrayWithContent):
         return out
 
     def cross(self, other, nested=False):
+        if isinstance(other, (list, tuple)):
+            if nested:
+                raise NotImplementedError("nested=True is only supported for the cross product of two arrays")
+            arrays, offsets, parents, columns = self._argcrossn(other)
+            out = self.JaggedArray.fromoffsets(offsets, self.Table.named("tuple", *[self._gathered(x._content, x._starts.reshape(-1)[parents] + i) for x, i in zip(arrays, columns)]).flattentuple())
+            out._parents = parents
+            return out
+
         if hasattr(self, "_nestedcross"):
             thyself = self._nestedcross
         else:
@@ -1142,7 +1278,7 @@ class JaggedArray(awkward.array.base.AwkwardArrayWithContent):
         argcross = thyself._argcross(other)
         left, right = argcross._content._contents.values()
 
-        out = self.JaggedArray.fromoffsets(argcross._offsets, self.Table.named("tuple", thyself._content[left], other._content[right]).flattentuple())
+        out = self.JaggedArray.fromoffsets(argcross._offsets, self.Table.named("tuple", self._gathered(thyself._content, left), self._gathered(other._content, right)).flattentuple())
         out._parents = argcross._parents
         out._iscross = True
 
@@ -1161,6 +1297,58 @@ class JaggedArray(awkward.array.base.AwkwardArrayWithContent):
 
         return out
 
+    def _itercombinations(self, numcombinations, bytespercombination, limitbytes, combine, filter):
+        # rows are grouped so that each batch's combinations (indexes, temporaries, and gathered content) fit in limitbytes
+        if limitbytes is None or limitbytes <= 0:
+            raise ValueError("limitbytes must be a positive number of bytes")
+        maxcombinations = max(1, int(limitbytes // bytespercombination))
+        cumulative = self.numpy.cumsum(numcombinations)
+
+        start = 0
+        while start < len(cumulative):
+            before = cumulative[start - 1] if start > 0 else 0
+            # every batch takes at least one row with combinations and any zero-combination rows after it:
+            # a batch of only empty sublists would fail in _argpairs/_argdistincts/_argcross (max of nothing)
+            firstnonzero = int(self.numpy.searchsorted(cumulative, before, side="right"))
+            stop = max(firstnonzero + 1, int(self.numpy.searchsorted(cumulative, before + maxcombinations, side="right")))
+            stop = min(stop, len(cumulative))
+            stop = int(self.numpy.searchsorted(cumulative, cumulative[stop - 1], side="right"))
+            out = combine(start, stop)
+            if filter is not None:
+                # applied before the next batch is made, so that only the survivors are ever held at once
+                out = out[filter(out)]
+            yield out
+            start = stop
+
+    def _combinationbytes(self, arg, *contents):
+        # the index arithmetic in _argpairs/_argdistincts/_argcross holds about eight index-sized arrays per combination
+        out = 8 * self.numpy.dtype(self.INDEXTYPE).itemsize
+        if not arg:
+            for content in contents:
+                out += content.nbytes / max(len(content), 1)
+        return out
+
+    def iterpairs(self, limitbytes=100*1024**2, filter=None, arg=False, nested=False):
+        self._valid()
+        counts = self.counts
+        combine = lambda start, stop: self[start:stop].argpairs(nested=nested) if arg else self[start:stop].pairs(nested=nested)
+        return self._itercombinations(counts * (counts + 1) >> 1, self._combinationbytes(arg, self._content, self._content), limitbytes, combine, filter)
+
+    def iterdistincts(self, limitbytes=100*1024**2, filter=None, arg=False, nested=False):
+        self._valid()
+        counts = self.counts
+        combine = lambda start, stop: self[start:stop].argdistincts(nested=nested) if arg else self[start:stop].distincts(nested=nested)
+        return self._itercombinations(counts * (counts - 1) >> 1, self._combinationbytes(arg, self._content, self._content), limitbytes, combine, filter)
+
+    def itercross(self, other, limitbytes=100*1024**2, filter=None, arg=False, nested=False):
+        self._valid()
+        if not isinstance(other, JaggedArray):
+            raise TypeError("both arrays must be JaggedArrays")
+        if len(self) != len(other):
+            raise ValueError("both JaggedArrays must have the same length")
+        combine = lambda start, stop: self[start:stop].argcross(other[start:stop], nested=nested) if arg else self[start:stop].cross(other[start:stop], nested=nested)
+        return self._itercombinations(self.counts * other.counts, self._combinationbytes(arg, self._content, other._content), limitbytes, combine, filter)
+
     def _canuseoffset(self):
         self._valid()
         return self.offsetsaliased(self._starts, self._stops) or (len(self._starts.shape) == 1 and self.numpy.array_equal(self._starts[1:], self._stops[:-1]))
@@ -1287,17 +1475,7 @@ class JaggedArray(awkward.array.base.AwkwardArrayWithContent):
         else:
             content = content.astype(dtype)
 
-        if identity == self.numpy.inf:
-            if issubclass(dtype.type, (self.numpy.bool_, self.numpy.bool)):
-                identity = True
-            elif self._util_isintegertype(dtype.type):
-                identity = self.numpy.iinfo(dtype.type).max
-
-        elif identity == -self.numpy.inf:
-            if issubclass(dtype.type, (self.numpy.bool_, self.numpy.bool)):
-                identity = False
-            elif self._util_isintegertype(dtype.type):
-                identity = self.numpy.iinfo(dtype.type).min
+        identity = self._reduceidentity(identity, dtype)
 
         if regularaxis is None:
             out = self.numpy.empty(thyself._starts.shape[:1], dtype=dtype)
@@ -1321,6 +1499,134 @@ class JaggedArray(awkward.array.base.AwkwardArrayWithContent):
         else:
             return out.reshape(self._starts.shape + self._content.shape[1:])
 
+    def _reduceidentity(self, identity, dtype):
+        if identity == self.numpy.inf:
+            if issubclass(dtype.type, (self.numpy.bool_, self.numpy.bool)):
+                identity = True
+            elif self._util_isintegertype(dtype.type):
+                identity = self.numpy.iinfo(dtype.type).max
+
+        elif identity == -self.numpy.inf:
+            if issubclass(dtype.type, (self.numpy.bool_, self.numpy.bool)):
+                identity = False
+            elif self._util_isintegertype(dtype.type):
+                identity = self.numpy.iinfo(dtype.type).min
+
+        return identity
+
+    _aggregations = ("count", "count_nonzero", "sum", "sumsq", "prod", "min", "max", "any", "all", "mean", "var", "std")
+
+    def agg(self, aggregations):
+        import awkward.array.table
+        self._valid()
+
+        if isinstance(aggregations, awkward.util.string):
+            aggregations = [aggregations]
+        aggregations = list(aggregations)
+        for n in aggregations:
+            if n not in self._aggregations:
+                raise ValueError("unrecognized aggregation {0}; must be one of {1}".format(repr(n), ", ".join(self._aggregations)))
+
+        if self._util_hasjagged(self._content):
+            return self.copy(content=self._content.agg(aggregations))
+
+        elif isinstance(self._content, awkward.array.table.Table):
+            out = self._content.copy(contents=[])
+            for n, x in self._content._contents.items():
+                out[n] = self.copy(content=x).agg(aggregations)
+            return out
+
+        # compact once; inner dimensions of the content are folded into each sublist, as the reducers do
+        windowoffsets, window = self._flatwindow()
+        inner = int(self.numpy.prod(window.shape[1:]))
+        offsets = windowoffsets * inner
+        counts = offsets[1:] - offsets[:-1]
+        nonempty = (counts != 0)
+        nonterminal = offsets[:-1][nonempty]
+        if os.name == "nt":    # Windows Numpy reduceat requires 32-bit indexes
+            nonterminal = nonterminal.astype(self.numpy.int32)
+
+        prepared = {}
+        def prepare(identity):
+            # masked or indexed content is filled with the reducer's identity, as in _reduce
+            if isinstance(window, awkward.array.base.AwkwardArray):
+                if identity not in prepared:
+                    prepared[identity] = window._prepare(identity, None).reshape(-1)
+                return prepared[identity]
+            else:
+                return window.reshape(-1)
+
+        def reduceat(ufunc, content, identity):
+            if ufunc is not self.numpy.logical_or and ufunc is not self.numpy.logical_and and issubclass(content.dtype.type, (self.numpy.bool_, self.numpy.bool)):
+                content = content.astype(self.numpy.dtype(type(identity)))
+            identity = self._reduceidentity(identity, content.dtype)
+            out = self.numpy.full(len(counts), identity, dtype=content.dtype)
+            if len(nonterminal) != 0:
+                out[nonempty] = ufunc.reduceat(content, nonterminal)
+            return out
+
+        def summable():
+            content = prepare(0)
+            if issubclass(content.dtype.type, (self.numpy.bool_, self.numpy.bool)):
+                content = content.astype(self.numpy.dtype(type(0)))
+            return content
+
+        results = {}
+        def get(n):
+            if n in results:
+                return results[n]
+
+            if n == "count":
+                results[n] = counts
+
+            elif n == "count_nonzero":
+                results[n] = reduceat(self.numpy.add, (prepare(0) != 0).astype(self.INDEXTYPE), 0)
+
+            elif n == "sum" or n == "sumsq":
+                # both additive sums in one reduceat
+                content = summable()
+                sums = self._segmentsum(offsets, [content, content * content])
+                results["sum"], results["sumsq"] = sums[:, 0], sums[:, 1]
+
+            elif n == "prod":
+                results[n] = reduceat(self.numpy.multiply, prepare(1), 1)
+
+            elif n == "min":
+                results[n] = reduceat(self.numpy.minimum, prepare(self.numpy.inf), self.numpy.inf)
+
+            elif n == "max":
+                results[n] = reduceat(self.numpy.maximum, prepare(-self.numpy.inf), -self.numpy.inf)
+
+            elif n == "any":
+                results[n] = reduceat(self.numpy.logical_or, prepare(False).astype(self.BOOLTYPE), False)
+
+            elif n == "all":
+                results[n] = reduceat(self.numpy.logical_and, prepare(True).astype(self.BOOLTYPE), True)
+
+            elif n == "mean" or n == "var":
+                # the same computation as mean() and var(), weighting masked entries by zero and keeping inner dimensions
+                if isinstance(window, awkward.array.base.AwkwardArray):
+                    content, valid = self._fillmasked(window)
+                    weight = valid.astype(self.numpy.float64)
+                else:
+                    content, weight = window, None
+                results["mean"], results["var"] = self._meanvar(windowoffsets, content, weight, 0)
+
+            elif n == "std":
+                results[n] = self.numpy.sqrt(get("var"))
+
+            return results[n]
+
+        out = self.Table.named("agg")
+        with self.numpy.errstate(invalid="ignore", divide="ignore"):
+            for n in aggregations:
+                x = get(n)
+                out[n] = x.reshape(self._starts.shape + x.shape[1:])
+        return out
+
+    def describe(self):
+        return self.agg(["count", "mean", "std", "min", "max"])
+
     def argmin(self):
         self._valid()
         if self._util_hasjagged(self._content):
@@ -1335,67 +1641,503 @@ class JaggedArray(awkward.array.base.AwkwardArrayWithContent):
         else:
             return self._argminmax(False)
 
-    def _argminmax(self, ismin):
-        if len(self._starts) == len(self._stops) == 0:
-            return self.copy()
+    def argsort(self, ascending=True, stable=False, by=None):
+        self._valid()
+        if by is None and isinstance(self._content, JaggedArray):
+            return self.copy(content=self._content.argsort(ascending=ascending, stable=stable))
+
+        offsets, parents, window, order = self._argsort(ascending, stable, by)
+        return self.copy(starts=offsets[:-1].reshape(self._starts.shape), stops=offsets[1:].reshape(self._starts.shape), content=order - offsets[:-1][parents])
+
+    def sort(self, ascending=True, stable=False, by=None):
+        self._valid()
+        if by is None and isinstance(self._content, JaggedArray):
+            return self.copy(content=self._content.sort(ascending=ascending, stable=stable))
+
+        offsets, parents, window, order = self._argsort(ascending, stable, by)
+        return self.copy(starts=offsets[:-1].reshape(self._starts.shape), stops=offsets[1:].reshape(self._starts.shape), content=window[order])
+
+    def _uniquekeys(self, window):
+        # sortable Numpy arrays that are equal exactly when the values are (primary key last, as in lexsort)
+        import awkward.array.objects
+        if isinstance(window, awkward.array.objects.StringArray):
+            return [self._stringranks(window)]
+
+        if not isinstance(window, self.numpy.ndarray):
+            raise TypeError("cannot find unique values of {0} content".format(type(window).__name__))
+        if len(window.shape) != 1:
+            raise ValueError("cannot find unique values because content is not one-dimensional")
+        return [window]
+
+    def _stringranks(self, strings):
+        # ranks in byte order, equal exactly when the strings are, without padding every string to the longest:
+        # each pass compares the next window of bytes of the strings still tied, as fixed-width keys that together
+        # stay within the size of the content, so the window grows quickly when only a few (long) strings are tied
+        offsets, flat = strings._content._flatwindow()
+        lengths = offsets[1:] - offsets[:-1]
+        budget = max(len(flat), len(lengths))
+
+        # rank is where a string's group of still-tied strings starts in the final order
+        rank = self.numpy.zeros(len(lengths), dtype=self.INDEXTYPE)
+        active = self.numpy.arange(len(lengths), dtype=self.INDEXTYPE)
+        position, width = 0, 8
+        while len(active) > 1:
+            # remaining length, capped at width + 1, puts "a" before "a\x00" and ends ties between equal strings
+            remaining = self.numpy.minimum(lengths[active] - position, width + 1)
+
+            # every width-byte window of the content as one overlapping strided view; only the active strings'
+            # windows are copied out, then zeroed past each string's end
+            extended = self.numpy.concatenate([flat, self.numpy.zeros(width, dtype=self.CHARTYPE)])
+            windows = self.numpy.lib.stride_tricks.as_strided(extended, (len(flat) + 1, width), (extended.strides[0], extended.strides[0]))
+            padded = windows[offsets[:-1][active] + position]
+            padded[self.numpy.arange(width) >= remaining[:, self.numpy.newaxis]] = 0
+            key = padded.view("S{0}".format(width)).reshape(-1)
+
+            order = self.numpy.lexsort((remaining, key, rank[active]))
+            active, key, remaining = active[order], key[order], remaining[order]
+            oldrank = rank[active]
+
+            # every tied group is active as a whole, so it splits in place at the positions where its keys change
+            index = self.numpy.arange(len(active), dtype=self.INDEXTYPE)
+            groupchange = self.numpy.ones(len(active), dtype=self.BOOLTYPE)
+            groupchange[1:] = (oldrank[1:] != oldrank[:-1])
+            change = groupchange.copy()
+            change[1:] |= (key[1:] != key[:-1]) | (remaining[1:] != remaining[:-1])
+            subfirst = self.numpy.maximum.accumulate(self.numpy.where(change, index, 0))
+            groupfirst = self.numpy.maximum.accumulate(self.numpy.where(groupchange, index, 0))
+            rank[active] = oldrank + (subfirst - groupfirst)
+
+            # still tied: more than one string in the new group and not all of it ended within this window
+            subgroup = self.numpy.cumsum(change) - 1
+            tied = (self.numpy.bincount(subgroup)[subgroup] > 1) & (remaining == width + 1)
+            active = active[tied]
+            position += width
+            width = max(8, min(2 * width, budget // max(1, len(active))))
+
+        return rank
+
+    def unique(self, return_index=False, return_counts=False):
+        self._valid()
+        if isinstance(self._content, JaggedArray):
+            out = self._content.unique(return_index=return_index, return_counts=return_counts)
+            if isinstance(out, tuple):
+                return tuple(self.copy(content=x) for x in out)
+            else:
+                return self.copy(content=out)
+
+        # one global sort by (parents, value); the first of each run of equal (parent, value) is kept
+        offsets, window = self._flatwindow()
+        parents = self.offsets2parents(offsets)
+        keys = self._uniquekeys(window)
+        order = self.numpy.lexsort(keys + [parents])
+
+        sortedparents = parents[order]
+        first = self.numpy.ones(len(order), dtype=self.BOOLTYPE)
+        first[1:] = (sortedparents[1:] != sortedparents[:-1])
+        for key in keys:
+            sortedkey = key[order]
+            different = (sortedkey[1:] != sortedkey[:-1])
+            if issubclass(sortedkey.dtype.type, self.numpy.inexact):
+                different &= ~(self.numpy.isnan(sortedkey[1:]) & self.numpy.isnan(sortedkey[:-1]))
+            first[1:] |= different
+
+        where = self.numpy.nonzero(first)[0]
+        index = order[where]
+        newoffsets = self.counts2offsets(self._bincount(sortedparents[where], len(offsets) - 1))
+        starts, stops = newoffsets[:-1].reshape(self._starts.shape), newoffsets[1:].reshape(self._starts.shape)
+
+        out = [self.copy(starts=starts, stops=stops, content=window[index])]
+        if return_index:
+            out.append(self.copy(starts=starts, stops=stops, content=index - offsets[:-1][parents[index]]))
+        if return_counts:
+            out.append(self.copy(starts=starts, stops=stops, content=self.numpy.diff(self.numpy.append(where, len(order)))))
+
+        if len(out) == 1:
+            return out[0]
+        else:
+            return tuple(out)
+
+    def argtopk(self, k, by=None, largest=True):
+        self._valid()
+        if by is None and isinstance(self._content, JaggedArray):
+            return self.copy(content=self._content.argtopk(k, largest=largest))
+
+        offsets, parents, window, order = self._argtopk(k, by, largest)
+        return self.copy(starts=offsets[:-1].reshape(self._starts.shape), stops=offsets[1:].reshape(self._starts.shape), content=order - self.counts2offsets(self.counts.reshape(-1))[:-1][parents])
+
+    def topk(self, k, by=None, largest=True):
+        self._valid()
+        if by is None and isinstance(self._content, JaggedArray):
+            return self.copy(content=self._content.topk(k, largest=largest))
+
+        offsets, parents, window, order = self._argtopk(k, by, largest)
+        return self.copy(starts=offsets[:-1].reshape(self._starts.shape), stops=offsets[1:].reshape(self._starts.shape), content=window[order])
+
+    def _argtopk(self, k, by, largest):
+        # select the k-th best value of every sublist (expected O(n)), keep only what can beat or tie it,
+        # and sort just those survivors, at most about k per sublist
+        if not self._util_isinteger(k) or k < 0:
+            raise ValueError("k must be a non-negative integer")
+
+        offsets, window = self._flatwindow()
+        if by is None:
+            key = window
+        elif isinstance(window, self.Table):
+            key = window[by]
+        else:
+            raise TypeError("'by' can only be used on a JaggedArray of Tables")
+        if not isinstance(key, self.numpy.ndarray) or len(key.shape) != 1:
+            raise ValueError("cannot select because the key is not a one-dimensional Numpy array")
 
-        if len(self._content.shape) != 1:
-            raise ValueError("cannot compute arg{0} because content is not one-dimensional".format("min" if ismin else "max"))
+        parents = self.offsets2parents(offsets)
+        numrows = len(offsets) - 1
+        if issubclass(key.dtype.type, self.numpy.inexact):
+            isnan = self.numpy.isnan(key)
+            active = self.numpy.nonzero(~isnan)[0]
+            valid = self._bincount(parents[active], numrows)
+        else:
+            isnan = None
+            active = self.numpy.arange(len(key), dtype=self.INDEXTYPE)
+            valid = offsets[1:] - offsets[:-1]
+
+        # sublists with k or fewer valid values keep everything, NaNs last
+        takeall = (valid <= k)
+        ranks = (valid - k) if largest else self.numpy.full(numrows, k - 1, dtype=self.INDEXTYPE)
+        threshold = self._segmentedselect(offsets, parents, key, ranks, active[~takeall[parents[active]]])
+        elementthreshold = threshold[parents]
+        with self.numpy.errstate(invalid="ignore"):
+            if largest:
+                candidate = (key >= elementthreshold)
+            else:
+                candidate = (key <= elementthreshold)
+        candidate |= takeall[parents]
+        if isnan is not None:
+            candidate &= ~isnan | takeall[parents]
+
+        # order the survivors by (parent, best first with NaN last), then keep the first k of each sublist;
+        # nonzero yields them in position order and lexsort is stable, so ties stay in position order
+        index = self.numpy.nonzero(candidate)[0]
+        candkey = key[index]
+        if largest:
+            if issubclass(candkey.dtype.type, (self.numpy.integer, self.numpy.bool_)):
+                candkey = ~candkey
+            else:
+                candkey = -candkey
+        index = index[self.numpy.lexsort((candkey, parents[index]))]
+        candparents = parents[index]
+        candcounts = self._bincount(candparents, numrows)
+        local = self.numpy.arange(len(index), dtype=self.INDEXTYPE) - (self.numpy.cumsum(candcounts) - candcounts)[candparents]
+        order = index[local < k].astype(self.INDEXTYPE)
+
+        newoffsets = self.counts2offsets(self.numpy.minimum(candcounts, k))
+        return newoffsets, parents[order], window, order
+
+    def _flatwindow(self):
+        # offsets starting at zero and the content they index, without copying if the array is already compact
+        offsets = self.counts2offsets(self.counts.reshape(-1))
+        compact = self.compact()
+        if len(self._starts) == 0:
+            return offsets, compact._content[:0]
+        else:
+            return offsets, compact._content[compact._starts.reshape(-1)[0]:][:offsets[-1]]
+
+    def _segmentsum(self, offsets, columns):
+        # sums of several content-length arrays in a single reduceat: (number of sublists,) + shape[1:] + (len(columns),)
+        stacked = self.numpy.stack(columns, axis=-1)
+        counts = offsets[1:] - offsets[:-1]
+        out = self.numpy.zeros((len(counts),) + stacked.shape[1:], dtype=stacked.dtype)
+        nonempty = (counts != 0)
+        if nonempty.any():
+            starts = offsets[:-1][nonempty]
+            if os.name == "nt":    # Windows Numpy reduceat requires 32-bit indexes
+                starts = starts.astype(self.numpy.int32)
+            out[nonempty] = self.numpy.add.reduceat(stacked, starts, axis=0)
+        return out
 
-        contentmax = self._content.max()
-        shiftval = self.numpy.ceil(contentmax) + 1
-        if math.isnan(shiftval) or math.isinf(shiftval) or shiftval != contentmax:
-            return self._argminmax_general(ismin)
+    def _bincount(self, indexes, length):
+        # Numpy < 1.14 rejects minlength=0, which is what an empty array asks for
+        return self.numpy.bincount(indexes, minlength=max(1, length))[:length]
 
-        flatstarts = self._starts.reshape(-1)
-        flatstops = self._stops.reshape(-1)
+    def _segmented(self, weight, fcn):
+        # fcn(offsets, content, weight content or None) -> one value per sublist
+        import awkward.array.table
+        self._valid()
 
-        nonempty = (flatstarts != flatstops)
-        nonterminal = (flatstarts < len(self._content))
-        flatstarts = flatstarts[nonterminal]
-        flatstops = flatstops[nonterminal]
+        if weight is not None:
+            if not isinstance(weight, JaggedArray):
+                raise TypeError("weight must be a JaggedArray with the same counts as the array")
+            weight._valid()
+            if weight._starts.shape != self._starts.shape or not (weight.counts == self.counts).all():
+                raise ValueError("weight must have the same counts as the array")
 
-        shift = self.numpy.zeros(self._content.shape, dtype=self.INDEXTYPE)
-        shift[flatstarts] = shiftval
-        self.numpy.cumsum(shift, out=shift)
+        if isinstance(self._content, JaggedArray):
+            offsets = self.counts2offsets(self.counts.reshape(-1))
+            content = self.flatten()._segmented(None if weight is None else weight.flatten(), fcn)
+            return self.copy(starts=offsets[:-1].reshape(self._starts.shape), stops=offsets[1:].reshape(self._starts.shape), content=content)
 
-        sortedindex = (self._content + shift).argsort()
+        elif isinstance(self._content, awkward.array.table.Table):
+            out = self._content.copy(contents=[])
+            for n, x in self._content._contents.items():
+                out[n] = self.copy(content=x)._segmented(weight, fcn)
+            return out
 
-        if ismin:
-            flatout = sortedindex[flatstarts] - flatstarts
+        offsets, content = self._flatwindow()
+        valid = None
+        if isinstance(content, awkward.array.base.AwkwardArray):
+            content, valid = self._fillmasked(content)
+        elif not isinstance(content, self.numpy.ndarray):
+            content = self.numpy.asarray(content)
+        if weight is None:
+            weightcontent = None
         else:
-            flatout = sortedindex[flatstops - 1] - flatstarts
+            weightcontent = self.numpy.asarray(weight._flatwindow()[1])
+            weightcontent = weightcontent.reshape((-1,) + (1,) * (len(content.shape) - 1))
 
-        newstarts = self.numpy.arange(len(nonempty), dtype=self.INDEXTYPE).reshape(self._starts.shape)
-        newstops = self.numpy.array(newstarts)
-        newstops.reshape(-1)[nonempty] += 1
-        return self.copy(starts=newstarts, stops=newstops, content=flatout)
+        # masked entries are skipped, as by the other reducers: they get zero weight
+        if valid is not None:
+            if weightcontent is None:
+                weightcontent = valid.astype(self.numpy.float64)
+            else:
+                weightcontent = self.numpy.where(valid, weightcontent, 0)
+
+        with self.numpy.errstate(invalid="ignore", divide="ignore"):
+            out = fcn(offsets, content, weightcontent)
+        return out.reshape(self._starts.shape + out.shape[1:])
+
+    def _fillmasked(self, content):
+        # masked or indexed content filled with 0, as _reduce does, and which entries were not masked:
+        # filling with 1 instead changes exactly the masked ones (NaNs in the content are not masked)
+        zero = content._prepare(0, None)
+        one = content._prepare(1, None)
+        return zero, (zero == one) | (zero != zero)
+
+    def _tofloat(self, content):
+        return content.astype(self.numpy.result_type(content.dtype, self.numpy.float64), copy=False)
+
+    def _sumweights(self, offsets, content, weight, columns):
+        # sum of weights (or counts) and the weighted sums of columns, all in one pass
+        counts = offsets[1:] - offsets[:-1]
+        if weight is None:
+            sums = self._segmentsum(offsets, columns)
+            sumw = counts.reshape((-1,) + (1,) * (len(sums.shape) - 2))
+            return sumw, [sums[..., i] for i in range(len(columns))]
+        else:
+            weight = self.numpy.broadcast_to(weight, content.shape)
+            sums = self._segmentsum(offsets, [weight] + [weight * x for x in columns])
+            return sums[..., 0], [sums[..., i + 1] for i in range(len(columns))]
+
+    def _meanvar(self, offsets, content, weight, ddof):
+        # shifted by each sublist's first value, so that E[x**2] - E[x]**2 doesn't cancel catastrophically
+        content = self._tofloat(content)
+        counts = offsets[1:] - offsets[:-1]
+        nonempty = (counts != 0)
+        shift = self.numpy.zeros((len(counts),) + content.shape[1:], dtype=content.dtype)
+        shift[nonempty] = content[offsets[:-1][nonempty]]
+        diff = content - self.numpy.repeat(shift, counts, axis=0)
+
+        sumw, (sumwx, sumwxx) = self._sumweights(offsets, content, weight, [diff, diff * diff])
+        mean = sumwx / sumw
+        var = self.numpy.maximum(sumwxx / sumw - mean * mean, 0)
+        if ddof != 0:
+            var = var * sumw / (sumw - ddof)
+        return shift + mean, var
+
+    def mean(self, weight=None):
+        def fcn(offsets, content, weight):
+            sumw, (sumwx,) = self._sumweights(offsets, content, weight, [self._tofloat(content)])
+            return sumwx / sumw
+        return self._segmented(weight, fcn)
+
+    def var(self, weight=None, ddof=0):
+        return self._segmented(weight, lambda offsets, content, weight: self._meanvar(offsets, content, weight, ddof)[1])
+
+    def std(self, weight=None, ddof=0):
+        return self._segmented(weight, lambda offsets, content, weight: self.numpy.sqrt(self._meanvar(offsets, content, weight, ddof)[1]))
+
+    def moment(self, n, weight=None):
+        # raw moment about zero, sum(w * x**n) / sum(w) per sublist; not about the mean, as scipy.stats.moment is
+        if not self._util_isinteger(n) or n < 0:
+            raise ValueError("n must be a non-negative integer")
+        def fcn(offsets, content, weight):
+            sumw, (sumwxn,) = self._sumweights(offsets, content, weight, [self._tofloat(content)**n])
+            return sumwxn / sumw
+        return self._segmented(weight, fcn)
+
+    def _segmentedselect(self, offsets, parents, content, ranks, active, successor=False):
+        # quickselect in every sublist at once: each pass keeps only the side of a random pivot that holds the rank,
+        # so the expected work is linear in the content (a full sort would be n log n); sublists without the rank get 0
+        # with successor=True, also return the value at rank + 1, found in the same pass (for interpolation)
+        numrows = len(offsets) - 1
+        out = self.numpy.zeros(numrows, dtype=content.dtype)
+        nextout = self.numpy.zeros(numrows, dtype=content.dtype)
+
+        # per-pass state covers only the sublists still unresolved, relabeled 0..m-1, so a pass costs
+        # O(active elements + active sublists), not O(all sublists)
+        rowof = parents[active]
+        counts = self._bincount(rowof, numrows)
+        ranks = self.numpy.array(ranks, dtype=self.INDEXTYPE)
+        alive = (ranks >= 0) & (ranks < counts)
+        rows = self.numpy.nonzero(alive)[0]
+        relabel = self.numpy.cumsum(alive) - 1
+        keep = alive[rowof]
+        active, rowof = active[keep], relabel[rowof[keep]]
+        ranks, counts = ranks[rows], counts[rows]
+        ceiling = self.numpy.zeros(len(rows), dtype=content.dtype)
+        random = self.numpy.random.RandomState(12345)
+
+        while len(rows) > 0:
+            values = content[active]
+            numactive = len(rows)
+            starts = self.numpy.cumsum(counts) - counts
+            pivot = values[starts + (random.random_sample(numactive) * counts).astype(self.INDEXTYPE)]
+
+            elementpivot = pivot[rowof]
+            less = (values < elementpivot)
+            equal = (values == elementpivot)
+            numless = self._bincount(rowof[less], numactive)
+            numlesseq = numless + self._bincount(rowof[equal], numactive)
+
+            found = (ranks >= numless) & (ranks < numlesseq)
+            out[rows[found]] = pivot[found]
+            if successor and found.any():
+                # rank + 1 is another copy of the pivot, the smallest value above it in this window, or (if there
+                # is none) the smallest value discarded above the window, which is the pivot of the last left move
+                nextout[rows[found]] = ceiling[found]
+                above = found[rowof] & ~less & ~equal
+                numabove = self._bincount(rowof[above], numactive)
+                nonempty = (numabove != 0)
+                if nonempty.any():
+                    abovestarts = (self.numpy.cumsum(numabove) - numabove)[nonempty]
+                    if os.name == "nt":    # Windows Numpy reduceat requires 32-bit indexes
+                        abovestarts = abovestarts.astype(self.numpy.int32)
+                    nextout[rows[nonempty]] = self.numpy.minimum.reduceat(values[above], abovestarts)
+                repeated = found & (ranks + 1 < numlesseq)
+                nextout[rows[repeated]] = pivot[repeated]
+
+            goleft = (ranks < numless)
+            goright = (ranks >= numlesseq)
+            ranks = self.numpy.where(goright, ranks - numlesseq, ranks)
+            counts = self.numpy.where(goleft, numless, counts - numlesseq)
+            ceiling = self.numpy.where(goleft, pivot, ceiling)
+
+            keep = (goleft[rowof] & less) | (goright[rowof] & ~less & ~equal)
+            alive = ~found
+            relabel = self.numpy.cumsum(alive) - 1
+            active, rowof = active[keep], relabel[rowof[keep]]
+            rows, ranks, counts, ceiling = rows[alive], ranks[alive], counts[alive], ceiling[alive]
+
+        if successor:
+            return out, nextout
+        else:
+            return out
+
+    def quantile(self, q):
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+
+        def fcn(offsets, content, weight):
+            if len(content.shape) != 1:
+                raise ValueError("cannot compute quantiles because content is not one-dimensional")
+
+            counts = offsets[1:] - offsets[:-1]
+            parents = self.offsets2parents(offsets)
+            if issubclass(content.dtype.type, self.numpy.inexact):
+                isnan = self.numpy.isnan(content)
+                active = self.numpy.nonzero(~isnan)[0]
+                hasnan = self._segmentsum(offsets, [isnan])[:, 0]
+            else:
+                active = self.numpy.arange(len(content), dtype=self.INDEXTYPE)
+                hasnan = None
+
+            # quantiles are unweighted, so a weight here only marks masked entries (zero) to skip
+            if weight is not None:
+                valid = (weight != 0)
+                active = active[valid[active]]
+                counts = self._segmentsum(offsets, [valid.astype(self.INDEXTYPE)])[:, 0]
+
+            # linear interpolation between the neighboring ranks, like numpy.quantile
+            position = q * (counts - 1)
+            below = self.numpy.floor(position).astype(self.INDEXTYPE)
+            above = self.numpy.ceil(position).astype(self.INDEXTYPE)
+            if (above != below).any():
+                out, nextout = self._segmentedselect(offsets, parents, content, below, active, successor=True)
+                out = out.astype(self.numpy.float64)
+                # only where the position falls between ranks, so that an exact inf is not turned into inf - inf
+                between = (above != below)
+                out[between] += (nextout[between] - out[between]) * (position - below)[between]
+            else:
+                out = self._segmentedselect(offsets, parents, content, below, active).astype(self.numpy.float64)
+            out[counts == 0] = self.numpy.nan
+            if hasnan is not None:
+                out[hasnan] = self.numpy.nan
+            return out
+
+        return self._segmented(None, fcn)
+
+    def median(self):
+        return self.quantile(0.5)
 
-    def _argminmax_general(self, ismin):
-        if len(self._content.shape) != 1:
-            raise ValueError("cannot compute arg{0} because content is not one-dimensional".format("min" if ismin else "max"))
+    def _argsort(self, ascending, stable, by):
+        # one segmented sort: order the whole content by key, then stably by parents
+        offsets, window = self._flatwindow()
 
-        if ismin:
-            optimum = self.numpy.argmin
+        if by is None:
+            key = window
+        elif isinstance(window, self.Table):
+            key = window[by]
         else:
-            optimum = self.numpy.argmax
+            raise TypeError("'by' can only be used on a JaggedArray of Tables")
+        if not isinstance(key, self.numpy.ndarray) or len(key.shape) != 1:
+            raise ValueError("cannot sort because the sort key is not a one-dimensional Numpy array")
 
-        out = self.numpy.empty(self._starts.shape + self._content.shape[1:], dtype=self.INDEXTYPE)
+        if ascending:
+            order = self.numpy.argsort(key, kind=("mergesort" if stable else "quicksort"))
+        else:
+            # a stable ascending sort of the reversed key, reversed again, is descending and keeps ties in order
+            order = (len(key) - 1) - self.numpy.argsort(key[::-1], kind="mergesort")[::-1]
+
+        parents = self.offsets2parents(offsets)
+        order = order[self.numpy.argsort(parents[order], kind="mergesort")].astype(self.INDEXTYPE)
+        return offsets, parents, window, order
+
+    def _argminmax(self, ismin):
+        if len(self._starts) == len(self._stops) == 0:
+            return self.copy()
+
+        # segmented min/max by reduceat over nonempty sublists, then the first position that attains it: O(n)
+        offsets, content = self._flatwindow()
+        counts = offsets[1:] - offsets[:-1]
+        nonempty = (counts != 0)
+        flatstarts = offsets[:-1][nonempty]
+        counts = counts[nonempty]
+
+        if len(flatstarts) == 0:
+            flatout = self.numpy.empty((0,) + content.shape[1:], dtype=self.INDEXTYPE)
+
+        else:
+            reduceatstarts = flatstarts
+            if os.name == "nt":    # Windows Numpy reduceat requires 32-bit indexes
+                reduceatstarts = reduceatstarts.astype(self.numpy.int32)
+
+            # reduceat runs each segment up to the next index, and the last one to the end of the window
+            if ismin:
+                optimum = self.numpy.minimum.reduceat(content, reduceatstarts, axis=0)
+            else:
+                optimum = self.numpy.maximum.reduceat(content, reduceatstarts, axis=0)
 
-        flatout = out.reshape((-1,) + self._content.shape[1:])
-        flatstarts = self._starts.reshape(-1)
-        flatstops = self._stops.reshape(-1)
+            # minimum/maximum propagate NaN, so a sublist with any NaN selects its first NaN, like numpy.argmin/argmax
+            optimum = self.numpy.repeat(optimum, counts, axis=0)
+            match = (content == optimum)
+            if issubclass(content.dtype.type, self.numpy.inexact):
+                match |= (self.numpy.isnan(content) & self.numpy.isnan(optimum))
 
-        content = self._content
-        for i, flatstart in enumerate(flatstarts):
-            flatstop = flatstops[i]
-            if flatstart != flatstop:
-                flatout[i] = optimum(content[flatstart:flatstop], axis=0)
+            index = self.numpy.arange(len(content), dtype=self.INDEXTYPE).reshape((-1,) + (1,) * (len(content.shape) - 1))
+            first = self.numpy.where(match, index, len(content))
+            flatout = self.numpy.minimum.reduceat(first, reduceatstarts, axis=0)
+            flatout -= flatstarts.reshape((-1,) + (1,) * (len(content.shape) - 1))
 
-        newstarts = self.numpy.arange(len(flatstarts), dtype=self.INDEXTYPE).reshape(self._starts.shape)
-        newstops = self.numpy.array(newstarts)
-        newstops.reshape(-1)[flatstarts != flatstops] += 1
-        return self.copy(starts=newstarts, stops=newstops, content=flatout)
+        offsets = self.counts2offsets(nonempty.astype(self.INDEXTYPE))
+        return self.copy(starts=offsets[:-1].reshape(self._starts.shape), stops=offsets[1:].reshape(self._starts.shape), content=flatout)
 
     @awkward.util.bothmethod
     def concatenate(isclassmethod, cls_or_self, arrays, axis=0):
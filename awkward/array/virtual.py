@@ -29,9 +29,12 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import importlib
+import threading
 from collections import OrderedDict
 
 import awkward.array.base
+import awkward.array.jagged
+import awkward.array.table
 import awkward.persist
 import awkward.type
 import awkward.util
@@ -57,6 +60,21 @@ class VirtualArray(awkward.array.base.AwkwardArray):
         def __getstate__(self):
             raise RuntimeError("VirtualArray.TransientKeys are not unique across processes, and hence should not be serialized")
 
+    class _Flight(object):
+        def __init__(self):
+            self.event = threading.Event()
+            self.array = None
+            self.error = None
+
+    # declared types are checked by comparing a cheap fingerprint of the materialized array (class, leaf dtypes
+    # and inner shapes) with the declared type's, falling back to the full check for anything else (masked, indexed,
+    # objects...); set check_type_deep = True to check deeply on every materialization
+    check_type_deep = False
+
+    # materializations in progress, so that concurrent requests for the same key run the generator once
+    _flights = {}
+    _flightslock = threading.Lock()
+
     def __init__(self, generator, args=(), kwargs={}, cache=None, persistentkey=None, type=None, nbytes=None, persistvirtual=True):
         self.generator = generator
         self.args = args
@@ -300,12 +318,12 @@ class VirtualArray(awkward.array.base.AwkwardArray):
 
         if self._array is None:
             # states (1) and (3)
-            return self.materialize()
+            return self._materialize(True)
 
         elif self._cache is None:
             if isinstance(self._array, (VirtualArray.TransientKey, awkward.util.string)):
                 # abnormal state (6)
-                return self.materialize()
+                return self._materialize(True)
             else:
                 # state (2)
                 return self._array
@@ -317,7 +335,7 @@ class VirtualArray(awkward.array.base.AwkwardArray):
                     return self._cache[self._array]
                 except:
                     # state (4), taking any error in __getitem__ as evidence that it was evicted
-                    return self.materialize()
+                    return self._materialize(True)
             else:
                 # abnormal state (7)
                 self._cache[self.key] = self._array
@@ -331,6 +349,123 @@ class VirtualArray(awkward.array.base.AwkwardArray):
             return self._array is not None and self._array in self._cache
 
     def materialize(self):
+        return self._materialize(False)
+
+    def _materialize(self, reuse):
+        # single-flight: the first caller for a key runs the generator, concurrent callers wait for its result
+        key = self.key
+        if self._cache is None:
+            flightkey = (None, id(self))
+        else:
+            flightkey = (id(self._cache), key)
+
+        with VirtualArray._flightslock:
+            flight = VirtualArray._flights.get(flightkey)
+            if flight is None:
+                flight = VirtualArray._flights[flightkey] = VirtualArray._Flight()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            if self._cache is None:
+                self._array = flight.array
+            else:
+                self._array = key
+            return flight.array
+
+        try:
+            array = None
+            if reuse:
+                # another caller may have finished between our check and getting the flight
+                if self._cache is None:
+                    if isinstance(self._array, (self.numpy.ndarray, awkward.array.base.AwkwardArray)):
+                        array = self._array
+                else:
+                    try:
+                        array = self._cache[key]
+                    except:
+                        pass
+                    else:
+                        self._array = key
+
+            if array is None:
+                array = self._generate()
+            flight.array = array
+            return array
+
+        except BaseException as err:
+            flight.error = err
+            raise
+
+        finally:
+            with VirtualArray._flightslock:
+                del VirtualArray._flights[flightkey]
+            flight.event.set()
+
+    @classmethod
+    def _fingerprintoftype(cls, tpe, seen):
+        # element type -> ("numpy", inner shape, dtype), ("jagged", content) or ("table", {column: ...}); None for the rest
+        if isinstance(tpe, cls.numpy.dtype):
+            return ("numpy", (), tpe) if tpe.names is None else None
+        elif id(tpe) in seen:
+            return None
+        seen = seen.union([id(tpe)])
+        if isinstance(tpe, awkward.type.ArrayType):
+            to = cls._fingerprintoftype(tpe.to, seen)
+            if to is None:
+                return None
+            elif tpe.takes == cls.numpy.inf:
+                return ("jagged", to)
+            elif to[0] == "numpy":
+                return ("numpy", (tpe.takes,) + to[1], to[2])
+            else:
+                return None
+        elif isinstance(tpe, awkward.type.TableType):
+            columns = {}
+            for n in tpe.columns:
+                columns[n] = cls._fingerprintoftype(tpe[n], seen)
+                if columns[n] is None:
+                    return None
+            return ("table", columns)
+        else:
+            return None
+
+    @classmethod
+    def _fingerprintofarray(cls, array):
+        # the same fingerprint for the elements of an array, without building its type
+        if type(array) is cls.numpy.ndarray:
+            return ("numpy", array.shape[1:], array.dtype) if array.dtype.names is None else None
+        elif isinstance(array, awkward.array.jagged.JaggedArray) and len(array._starts.shape) == 1:
+            content = cls._fingerprintofarray(array._content)
+            return None if content is None else ("jagged", content)
+        elif type(array) is awkward.array.table.Table:
+            columns = {}
+            for n, x in array._contents.items():
+                columns[n] = cls._fingerprintofarray(x)
+                if columns[n] is None:
+                    return None
+            return ("table", columns)
+        else:
+            return None
+
+    def _typefingerprint(self):
+        # computed once per declared type and kept on the type object, so that new VirtualArrays declaring it share it
+        cached = getattr(self._type, "_virtualfingerprint", None)
+        if cached is None or cached[0] is not self._type.to:
+            cached = self._type._virtualfingerprint = (self._type.to, self._fingerprintoftype(self._type.to, frozenset()))
+        return cached[1]
+
+    def _checktype_fast(self, array):
+        if self.check_type_deep or not isinstance(self._type, awkward.type.ArrayType) or len(array) != self._type.takes:
+            return False
+        fingerprint = self._typefingerprint()
+        return fingerprint is not None and fingerprint == self._fingerprintofarray(array)
+
+    def _generate(self):
         array = self._util_toarray(self._generator(*self._args, **self._kwargs), self.DEFAULTTYPE)
         if self._setitem is not None:
             for n, x in self._setitem.items():
@@ -339,7 +474,7 @@ class VirtualArray(awkward.array.base.AwkwardArray):
             for n in self._delitem:
                 del array[n]
 
-        if self._type is not None:
+        if self._type is not None and not self._checktype_fast(array):
             materializedtype = awkward.type.fromarray(array)
             if ((isinstance(self._type, awkward.type.Type) and not self._type._eq(materializedtype, set(), ignoremask=True)) or
                 (not isinstance(self._type, awkward.type.Type) and not self._type == materializedtype)):
@@ -358,7 +493,8 @@ class VirtualArray(awkward.array.base.AwkwardArray):
     def __del__(self):
         # TransientKeys are based on runtime ids, which Python may reuse after an object is garbage collected
         # they *MUST* be removed from the cache to avoid confusion; persistentkeys can (and should) stay in
-        if getattr(self, "_cache", None) is not None and isinstance(self._array, VirtualArray.TransientKey):
+        # only our own key: a copy shares the original's _array until it materializes for itself
+        if getattr(self, "_cache", None) is not None and isinstance(getattr(self, "_array", None), VirtualArray.TransientKey) and self._array == VirtualArray.TransientKey(id(self)):
             try:
                 del self._cache[self._array]
             except:
@@ -29,6 +29,8 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import json
+import os
+import threading
 
 import numpy
 
@@ -483,7 +485,23 @@ class _ParquetFile(object):
         import pyarrow.parquet
         self.parquetfile = pyarrow.parquet.ParquetFile(self.file, metadata=self.metadata, common_metadata=self.common_metadata)
         self.type = schema2type(self.parquetfile.schema.to_arrow_schema())
-        
+        self._touched = []
+        self._lock = threading.Lock()
+
+        # only a path, as of its modification time and size, names the same data in every process and for every open;
+        # file-like objects get no shared keys
+        if isinstance(self.file, awkward.util.string):
+            stat = os.stat(self.file)
+            self._keyprefix = "{0}:{1}:{2}:".format(os.path.abspath(self.file), stat.st_mtime, stat.st_size)
+        else:
+            self._keyprefix = None
+
+    def key(self, rowgroup, column):
+        if self._keyprefix is None:
+            return None
+        else:
+            return "{0}{1}:{2}".format(self._keyprefix, rowgroup, column)
+
     def __getstate__(self):
         return {"file": self.file, "metadata": self.metadata, "common_metadata": self.common_metadata}
 
@@ -495,7 +513,27 @@ class _ParquetFile(object):
         self._init()
 
     def __call__(self, rowgroup, column):
-        return fromarrow(self.parquetfile.read_row_group(rowgroup, columns=[column]))[column]
+        # one read_row_group for this column and every column already touched in another row group,
+        # which are likely to be wanted here too: they wait in the cache under their own keys
+        key = self.key(rowgroup, column)
+        if self.cache is None or key is None:
+            return fromarrow(self.parquetfile.read_row_group(rowgroup, columns=[column]))[column]
+
+        try:
+            return self.cache[key]
+        except KeyError:
+            pass
+
+        # the lock guards only the bookkeeping, so that row groups can be read in parallel
+        with self._lock:
+            if column not in self._touched:
+                self._touched.append(column)
+            columns = [column] + [x for x in self._touched if x != column and self.key(rowgroup, x) not in self.cache]
+
+        table = fromarrow(self.parquetfile.read_row_group(rowgroup, columns=columns))
+        for x in columns[1:]:
+            self.cache[self.key(rowgroup, x)] = table[x]
+        return table[column]
 
     def tojson(self):
         json.dumps([self.file, self.metadata, self.common_metadata])
@@ -505,22 +543,81 @@ class _ParquetFile(object):
     def fromjson(cls, state):
         return cls(state["file"], cache=None, metadata=state["metadata"], common_metadata=state["common_metadata"])
 
-def fromparquet(file, awkwardlib=None, cache=None, persistvirtual=False, metadata=None, common_metadata=None):
+_comparisons = {
+    "==": lambda lo, hi, x: lo <= x <= hi,
+    "=": lambda lo, hi, x: lo <= x <= hi,
+    "!=": lambda lo, hi, x: not (lo == x == hi),
+    "<": lambda lo, hi, x: lo < x,
+    "<=": lambda lo, hi, x: lo <= x,
+    ">": lambda lo, hi, x: hi > x,
+    ">=": lambda lo, hi, x: hi >= x,
+    "in": lambda lo, hi, x: any(lo <= y <= hi for y in x),
+    "not in": lambda lo, hi, x: not (lo == hi and lo in x),
+    }
+
+def _normalizefilters(filters):
+    # a list of (column, op, value) is a conjunction; a list of such lists is a disjunction of conjunctions
+    if filters is None:
+        return None
+    filters = list(filters)
+    if len(filters) == 0 or isinstance(filters[0], tuple):
+        filters = [filters]
+    out = []
+    for conjunction in filters:
+        out.append([])
+        for column, op, value in conjunction:
+            if op not in _comparisons:
+                raise ValueError("unrecognized filter operator {0}; expected one of {1}".format(repr(op), ", ".join(repr(x) for x in _comparisons)))
+            out[-1].append((column, op, value))
+    return out
+
+def _rowgroup_maymatch(rowgroup, filters):
+    # False only if the row group's min/max statistics prove that no row passes filters
+    stats = {}
+    for j in range(rowgroup.num_columns):
+        column = rowgroup.column(j)
+        if column.statistics is not None and column.statistics.has_min_max:
+            stats[column.path_in_schema] = (column.statistics.min, column.statistics.max)
+
+    for conjunction in filters:
+        for column, op, value in conjunction:
+            if column in stats:
+                lo, hi = stats[column]
+                try:
+                    if not _comparisons[op](lo, hi, value):
+                        break
+                except TypeError:
+                    pass
+        else:
+            return True
+    return False
+
+def fromparquet(file, awkwardlib=None, cache=None, persistvirtual=False, metadata=None, common_metadata=None, filters=None):
     awkwardlib = awkward.util.awkwardlib(awkwardlib)
     parquetfile = _ParquetFile(file, cache=cache, metadata=metadata, common_metadata=common_metadata)
     columns = parquetfile.type.columns
+    filters = _normalizefilters(filters)
+
+    # share cache entries with _ParquetFile's coalesced reads, but only if the key means the same thing in another process
+    if cache is not None and isinstance(file, awkward.util.string):
+        persistentkey = parquetfile.key
+    else:
+        persistentkey = lambda rowgroup, column: None
 
     chunks = []
     counts = []
     for i in range(parquetfile.parquetfile.num_row_groups):
-        numrows = parquetfile.parquetfile.metadata.row_group(i).num_rows
+        rowgroup = parquetfile.parquetfile.metadata.row_group(i)
+        numrows = rowgroup.num_rows
+        if filters is not None and not _rowgroup_maymatch(rowgroup, filters):
+            continue
         if numrows > 0:
             if columns == [""]:
-                chunk = awkwardlib.VirtualArray(parquetfile, (i, ""), cache=cache, type=awkwardlib.type.ArrayType(numrows, parquetfile.type[""]), persistvirtual=persistvirtual)
+                chunk = awkwardlib.VirtualArray(parquetfile, (i, ""), cache=cache, persistentkey=persistentkey(i, ""), type=awkwardlib.type.ArrayType(numrows, parquetfile.type[""]), persistvirtual=persistvirtual)
             else:
                 chunk = awkwardlib.Table()
                 for n in columns:
-                    q = awkwardlib.VirtualArray(parquetfile, (i, n), cache=cache, type=awkwardlib.type.ArrayType(numrows, parquetfile.type[n]), persistvirtual=persistvirtual)
+                    q = awkwardlib.VirtualArray(parquetfile, (i, n), cache=cache, persistentkey=persistentkey(i, n), type=awkwardlib.type.ArrayType(numrows, parquetfile.type[n]), persistvirtual=persistvirtual)
                     chunk.contents[n] = q
 
             chunks.append(chunk)
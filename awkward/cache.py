@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019, IRIS-HEP
+# All rights reserved.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# 
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# 
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import threading
+from collections import OrderedDict
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+class ArrayCache(MutableMapping):
+    """
+    ArrayCache
+
+    Thread-safe, least-recently-used cache for VirtualArray materializations that holds at most `limitbytes` of arrays (by `nbytes`).
+    """
+
+    def __init__(self, limitbytes):
+        if limitbytes < 0:
+            raise ValueError("limitbytes must be a non-negative integer")
+        self._limitbytes = limitbytes
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._nbytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytesloaded = 0
+
+    @property
+    def limitbytes(self):
+        return self._limitbytes
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def __repr__(self):
+        return "<ArrayCache {0} of {1} bytes in {2} arrays>".format(self._nbytes, self._limitbytes, len(self._data))
+
+    def __getitem__(self, where):
+        with self._lock:
+            try:
+                out = self._data.pop(where)
+            except KeyError:
+                self.misses += 1
+                raise
+            self._data[where] = out
+            self.hits += 1
+            return out
+
+    def __setitem__(self, where, what):
+        size = getattr(what, "nbytes", 0)
+        with self._lock:
+            if where in self._data:
+                self._remove(where)
+            self.bytesloaded += size
+            if size > self._limitbytes:
+                # would evict everything and still not fit
+                self.evictions += 1
+                return
+            self._data[where] = what
+            self._sizes[where] = size
+            self._nbytes += size
+            while self._nbytes > self._limitbytes:
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def __delitem__(self, where):
+        with self._lock:
+            self._remove(where)
+
+    def _remove(self, where):
+        del self._data[where]
+        self._nbytes -= self._sizes.pop(where)
+
+    def __contains__(self, where):
+        # no effect on counters or recency (VirtualArray.ismaterialized asks this)
+        with self._lock:
+            return where in self._data
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._nbytes = 0
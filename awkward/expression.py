@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019, IRIS-HEP
+# All rights reserved.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# 
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# 
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import numbers
+
+import awkward.array.base
+import awkward.array.jagged
+
+blocksize = 2**16
+
+def _flatten(jagged):
+    # (array, offsets from zero) of every nesting level and the innermost content, without copying compact arrays
+    levels = []
+    content = jagged
+    while isinstance(content, awkward.array.jagged.JaggedArray):
+        offsets, window = content._flatwindow()
+        levels.append((content, offsets))
+        content = window
+    return levels, content
+
+def evaluate(fcn, *arrays, **options):
+    """
+    Applies `fcn`, a function of Numpy arrays (typically a chain of ufuncs like `lambda px, py: numpy.sqrt(px**2 + py**2) > 20`), to the contents of JaggedArrays in one pass.
+
+    The jagged structure of all arguments is checked once, and `fcn` is evaluated on blocks of `blocksize` elements of the flattened contents (small enough for its temporaries to stay in cache), filling a single output array. Non-jagged Numpy arrays are per-sublist values, broadcast to each element, and Python numbers are passed through.
+    """
+    size = options.pop("blocksize", blocksize)
+    if options:
+        raise TypeError("unrecognized options: {0}".format(", ".join(sorted(options))))
+    if size <= 0:
+        raise ValueError("blocksize must be a positive integer")
+
+    jaggeds = [x for x in arrays if isinstance(x, awkward.array.jagged.JaggedArray)]
+    if len(jaggeds) == 0:
+        raise TypeError("at least one argument must be a JaggedArray")
+    first = jaggeds[0]
+    first._valid()
+    numpy = first.numpy
+
+    levels, content = _flatten(first)
+    flat = []
+    for x in arrays:
+        if isinstance(x, awkward.array.jagged.JaggedArray):
+            if x is first:
+                flat.append(content)
+                continue
+            x._valid()
+            xlevels, xcontent = _flatten(x)
+            if len(xlevels) != len(levels) or any(xoffsets.shape != offsets.shape or not numpy.array_equal(xoffsets, offsets) for (_, xoffsets), (_, offsets) in zip(xlevels, levels)):
+                raise ValueError("all JaggedArrays must have the same jagged structure")
+            flat.append(xcontent)
+
+        elif isinstance(x, numbers.Number):
+            flat.append(x)
+
+        elif isinstance(x, awkward.array.base.AwkwardArray):
+            raise TypeError("cannot evaluate {0} arguments; only JaggedArrays, Numpy arrays, and numbers".format(type(x).__name__))
+
+        else:
+            x = numpy.asarray(x)
+            if len(x) != len(first):
+                raise ValueError("non-jagged arguments must have one value per sublist ({0}), not {1}".format(len(first), len(x)))
+            flat.append(x)
+
+    for x in flat:
+        if isinstance(x, awkward.array.base.AwkwardArray):
+            raise TypeError("cannot evaluate JaggedArrays of {0}; content must be Numpy arrays".format(type(x).__name__))
+
+    # per-sublist arguments are broadcast through the parents of every level, a block at a time
+    parents = None
+    perlist = [not isinstance(x, awkward.array.jagged.JaggedArray) and not isinstance(x, numbers.Number) for x in arrays]
+    if any(perlist):
+        parents = numpy.arange(len(first.counts.reshape(-1)), dtype=first.INDEXTYPE)
+        for jagged, offsets in levels:
+            parents = parents[jagged.offsets2parents(offsets)]
+
+    def block(start, stop):
+        args = []
+        for x, isperlist in zip(flat, perlist):
+            if isperlist:
+                args.append(x.reshape((-1,) + x.shape[len(first._starts.shape):])[parents[start:stop]])
+            elif isinstance(x, numbers.Number):
+                args.append(x)
+            else:
+                args.append(x[start:stop])
+        return numpy.asarray(fcn(*args))
+
+    length = len(content)
+    head = block(0, min(size, length))
+    out = numpy.empty((length,) + head.shape[1:], dtype=head.dtype)
+    out[:len(head)] = head
+    for start in range(len(head), length, size):
+        stop = min(start + size, length)
+        out[start:stop] = block(start, stop)
+
+    # rebuild the jagged structure from the innermost level out
+    for jagged, offsets in reversed(levels):
+        shape = jagged._starts.shape
+        out = jagged.copy(starts=offsets[:-1].reshape(shape), stops=offsets[1:].reshape(shape), content=out)
+    return out
@@ -29,12 +29,16 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import base64
+import collections
 import fnmatch
 import importlib
 import json
+import multiprocessing.pool
 import numbers
 import os
 import pickle
+import struct
+import sys
 import zipfile
 import zlib
 try:
@@ -42,6 +46,20 @@ try:
 except ImportError:
     from collections import Mapping, MutableMapping
 
+import bz2
+try:
+    import lzma
+except ImportError:
+    lzma = None
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 import numpy
 
 import awkward.type
@@ -53,11 +71,37 @@ compression = [
 
 partner = {
     zlib.compress: ("zlib", "decompress"),
+    bz2.compress: ("bz2", "decompress"),
+    }
+
+incremental = {
+    zlib.compress: zlib.compressobj,
+    bz2.compress: bz2.BZ2Compressor,
     }
 
+if lzma is not None:
+    partner[lzma.compress] = ("lzma", "decompress")
+    incremental[lzma.compress] = lzma.LZMACompressor
+
+if lz4 is not None:
+    partner[lz4.frame.compress] = ("lz4.frame", "decompress")
+
+if zstandard is not None and hasattr(zstandard, "compress"):
+    partner[zstandard.compress] = ("zstandard", "decompress")
+
+filters = ("delta", "shuffle")
+
+blocksize = 1024**2
+
+lazycontexts = ("Table.contents", "ChunkedArray.chunk", "AppendableArray.chunk")
+
 whitelist = [["awkward.util", "frombuffer"],
              ["numpy", "frombuffer"],
              ["zlib", "decompress"],
+             ["bz2", "decompress"],
+             ["lzma", "decompress"],
+             ["lz4.frame", "decompress"],
+             ["zstandard", "decompress"],
              ["awkward", "*Array"],
              ["awkward", "Table"],
              ["awkward", "numpy", "frombuffer"],
@@ -217,6 +261,54 @@ def json2type(obj, whitelist=whitelist):
 
     return awkward.type._resolve(recurse(obj), {})
 
+def _projecttype(tpe, columns):
+    # type after deserialize(columns=...), which keeps only those columns of the outermost Table;
+    # None if that Table isn't reached through plain array dimensions (then no type is declared)
+    if isinstance(tpe, awkward.type.ArrayType):
+        to = _projecttype(tpe.to, columns)
+        return None if to is None else awkward.type.ArrayType(tpe.takes, to)
+    elif isinstance(tpe, awkward.type.TableType):
+        out = awkward.type.TableType()
+        for n in tpe.columns:
+            if n in columns:
+                out[n] = tpe[n]
+        return out
+    elif isinstance(tpe, numpy.dtype):
+        return tpe
+    else:
+        return None
+
+def _bytesview(obj):
+    # flat uint8 view of an array's memory; only copies if it isn't C-contiguous
+    return numpy.ascontiguousarray(obj).reshape(-1).view(numpy.uint8)
+
+def _compressiter(view, compressobj):
+    compressor = compressobj()
+    for i in range(0, len(view), blocksize):
+        out = compressor.compress(view[i : i + blocksize])
+        if len(out) > 0:
+            yield out
+    yield compressor.flush()
+
+def delta(array):
+    # monotonic indexes (offsets, starts) become small, repetitive differences
+    out = numpy.empty_like(array)
+    out[:1] = array[:1]
+    numpy.subtract(array[1:], array[:-1], out=out[1:])
+    return out
+
+def undelta(array):
+    return numpy.cumsum(array, axis=0, dtype=array.dtype)
+
+def shuffle(array):
+    # group byte i of every item together, so that slowly varying high bytes form long runs
+    array = numpy.ascontiguousarray(array)
+    return numpy.ascontiguousarray(array.reshape(-1).view(numpy.uint8).reshape(-1, array.dtype.itemsize).T).reshape(-1)
+
+def unshuffle(buffer, itemsize):
+    buffer = numpy.frombuffer(buffer, dtype=numpy.uint8)
+    return numpy.ascontiguousarray(buffer.reshape(itemsize, -1).T).reshape(-1)
+
 def jsonable(obj):
     if obj is None:
         return obj
@@ -242,7 +334,26 @@ def jsonable(obj):
     else:
         raise TypeError("object cannot be losslessly serialized as JSON")
 
-def serialize(obj, storage, name=None, delimiter="-", suffix=None, schemasuffix=None, compression=compression, **kwargs):
+def _payload(streaming, compress, data):
+    if compress is None:
+        if streaming:
+            return [_bytesview(data)]
+        else:
+            return data.tostring()
+    elif not streaming:
+        return compress(data)
+    elif compress in incremental:
+        return _compressiter(_bytesview(data), incremental[compress])
+    else:
+        return [compress(data)]
+
+def _payloadlist(streaming, compress, data):
+    out = _payload(streaming, compress, data)
+    if streaming:
+        out = list(out)
+    return out
+
+def serialize(obj, storage, name=None, delimiter="-", suffix=None, schemasuffix=None, compression=compression, threads=None, **kwargs):
     import awkward.array.base
     import awkward.array.virtual
 
@@ -290,12 +401,64 @@ def serialize(obj, storage, name=None, delimiter="-", suffix=None, schemasuffix=
             except TypeError:
                 tpes = (tpes,)
         contexts = x.get("contexts", "*")
+        if isinstance(contexts, str):
+            contexts = [contexts]
         pair = x["pair"]
+        if callable(pair):
+            if not pair in partner:
+                raise ValueError("decompression partner for {0} not known".format(pair))
+            pair = (pair, partner[pair])
+
+        fltrs = x.get("filters", ())
+        if isinstance(fltrs, str):
+            fltrs = (fltrs,)
+        for fltr in fltrs:
+            if fltr not in filters:
+                raise ValueError("unrecognized compression filter {0}; expected one of {1}".format(repr(fltr), ", ".join(repr(y) for y in filters)))
+
+        normalized.append({"minsize": minsize, "types": tpes, "contexts": contexts, "pair": pair, "filters": fltrs})
+
+    if threads is not None and threads > 1:
+        pool = multiprocessing.pool.ThreadPool(threads)
+    else:
+        pool = None
+
+    # (key, streaming, payload or AsyncResult, nbytes) in serial order, so the output is the same as without threads
+    pending = collections.deque()
+
+    def flush(limit):
+        while len(pending) > limit:
+            key, streaming, payload, nbytes = pending.popleft()
+            if isinstance(payload, multiprocessing.pool.AsyncResult):
+                payload = payload.get()
+            if streaming:
+                storage.writeiter(key, payload, nbytes)
+            else:
+                storage[key] = payload
 
-        normalized.append({"minsize": minsize, "types": tpes, "contexts": contexts, "pair": pair})
+    def store(key, compress, data, nbytes):
+        streaming = hasattr(storage, "writeiter") and not data.dtype.hasobject
+        if pool is None or compress is None:
+            pending.append((key, streaming, _payload(streaming, compress, data), nbytes))
+        else:
+            pending.append((key, streaming, pool.apply_async(_payloadlist, (streaming, compress, data)), nbytes))
+        # bound the number of compressed buffers held in memory
+        flush(0 if pool is None else 2*threads)
 
     seen = {}
     def fill(obj, context, prefix, suffix, schemasuffix, storage, compression, **kwargs):
+        out = _fill(obj, context, prefix, suffix, schemasuffix, storage, compression, **kwargs)
+
+        # members that deserialize(..., lazy=True) can defer need their type (length) up front
+        if context in lazycontexts and "call" in out and not isinstance(obj, awkward.array.virtual.VirtualArray):
+            try:
+                out["type"] = type2json(awkward.type.fromarray(obj))
+            except TypeError:
+                pass
+
+        return out
+
+    def _fill(obj, context, prefix, suffix, schemasuffix, storage, compression, **kwargs):
         if id(obj) in seen:
             return {"ref": seen[id(obj)]}
 
@@ -312,19 +475,37 @@ def serialize(obj, storage, name=None, delimiter="-", suffix=None, schemasuffix=
                 dtype = obj.dtype
 
             for policy in normalized:
-                minsize, tpes, contexts, pair = policy["minsize"], policy["types"], policy["contexts"], policy["pair"]
+                minsize, tpes, contexts, pair, fltrs = policy["minsize"], policy["types"], policy["contexts"], policy["pair"], policy["filters"]
                 if obj.nbytes >= minsize and issubclass(obj.dtype.type, tuple(tpes)) and any(fnmatch.fnmatchcase(context, p) for p in contexts):
                     compress, decompress = pair
-                    storage[prefix + str(ident) + suffix] = compress(obj)
 
-                    return {"id": ident,
-                            "call": ["awkward", "numpy", "frombuffer"],
-                            "args": [{"call": decompress, "args": [{"read": str(ident) + suffix}]},
-                                     {"dtype": dtype2json(dtype)},
-                                     {"json": len(obj)}]}
+                    # delta is only exact (with wrap-around) for integers
+                    isdelta = "delta" in fltrs and issubclass(obj.dtype.type, numpy.integer)
+                    isshuffle = "shuffle" in fltrs and obj.dtype.itemsize > 1
+                    data = obj
+                    if isdelta:
+                        data = delta(data)
+                    if isshuffle:
+                        data = shuffle(data)
+
+                    store(prefix + str(ident) + suffix, compress, data, obj.nbytes)
+
+                    read = {"call": decompress, "args": [{"read": str(ident) + suffix}]}
+                    if isshuffle:
+                        read = {"call": ["awkward.persist", "unshuffle"], "args": [read, {"json": obj.dtype.itemsize}]}
+
+                    out = {"call": ["awkward", "numpy", "frombuffer"],
+                           "args": [read,
+                                    {"dtype": dtype2json(dtype)},
+                                    {"json": len(obj)}]}
+                    if isdelta:
+                        out = {"call": ["awkward.persist", "undelta"], "args": [out]}
+
+                    out["id"] = ident
+                    return out
 
             else:
-                storage[prefix + str(ident) + suffix] = obj.tostring()
+                store(prefix + str(ident) + suffix, None, obj, obj.nbytes)
                 return {"id": ident,
                         "call": ["awkward", "numpy", "frombuffer"],
                         "args": [{"read": str(ident) + suffix},
@@ -365,15 +546,22 @@ def serialize(obj, storage, name=None, delimiter="-", suffix=None, schemasuffix=
             else:
                 return {"id": ident, "json": obj}
 
-    schema = {"awkward": awkward.version.__version__,
-              "schema": fill(obj, "", prefix, suffix, schemasuffix, storage, compression, **kwargs)}
+    try:
+        schema = {"awkward": awkward.version.__version__,
+                  "schema": fill(obj, "", prefix, suffix, schemasuffix, storage, compression, **kwargs)}
+        flush(0)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
     if prefix != "":
         schema["prefix"] = prefix
 
     storage[name + schemasuffix] = json.dumps(schema).encode("ascii")
     return schema
 
-def deserialize(storage, name="", awkwardlib="awkward", whitelist=whitelist, cache=None):
+def deserialize(storage, name="", awkwardlib="awkward", whitelist=whitelist, cache=None, lazy=False, columns=None, keyprefix=None, threads=None):
     import awkward.array.virtual
 
     schema = storage[name]
@@ -394,11 +582,93 @@ def deserialize(storage, name="", awkwardlib="awkward", whitelist=whitelist, cac
     elif len(whitelist) > 0 and isinstance(whitelist[0], str):
         whitelist = [whitelist]
 
-    def unfill(schema):
+    if isinstance(columns, str):
+        columns = [columns]
+
+    # every node with an "id", so that a "ref" into a deferred (lazy) or pruned (columns) subtree can unfill it on demand
+    nodes = {}
+    def index(schema):
         if isinstance(schema, dict):
-            if "call" in schema and isinstance(schema["call"], list) and len(schema["call"]) > 0:
+            if "id" in schema:
+                nodes[schema["id"]] = schema
+            for x in schema.values():
+                index(x)
+        elif isinstance(schema, list):
+            for x in schema:
+                index(x)
+    index(schema)
+
+    def unfillref(ref):
+        if ref not in seen:
+            unfill(nodes[ref], False)
+        return seen[ref]
+
+    def unfilllazy(schema, project):
+        # Table columns and chunks become VirtualArrays that read their members only when touched
+        if lazy and isinstance(schema, dict) and "call" in schema and "id" in schema:
+            if "type" in schema:
+                tpe = json2type(schema["type"], whitelist=whitelist)
+                if project and columns is not None:
+                    tpe = _projecttype(tpe, columns)
+            else:
+                tpe = None
+            # without a keyprefix that identifies the storage, keys are transient (scoped to each VirtualArray);
+            # a projected read holds different arrays than a full read, so its keys name the columns
+            if keyprefix is None:
+                persistentkey = None
+            elif project and columns is not None:
+                persistentkey = "{0}{1}:{2}".format(keyprefix, schema["id"], ",".join(columns))
+            else:
+                persistentkey = keyprefix + str(schema["id"])
+            out = awkward.array.virtual.VirtualArray(unfill, (schema, project), cache=cache, persistentkey=persistentkey, type=tpe, persistvirtual=False)
+            seen[schema["id"]] = out
+            return out
+        else:
+            return unfill(schema, project)
+
+    # id(schema node) -> AsyncResult of a decompression running on the thread pool
+    decompressing = {}
+
+    def decompress(schema, project=True, pool=None):
+        # start every decompress(read) call that an eager unfill will need
+        if isinstance(schema, dict):
+            args = schema.get("args", [])
+            if "call" in schema and len(args) == 1 and isinstance(args[0], dict) and "read" in args[0] and "kwargs" not in schema and not schema.get("cacheable", False) and not schema.get("whitelistable", False):
+                gen = spec2function(schema["call"], awkwardlib=awkwardlib, whitelist=whitelist)
+                if args[0].get("absolute", False):
+                    raw = storage[args[0]["read"]]
+                else:
+                    raw = storage[prefix + args[0]["read"]]
+                decompressing[id(schema)] = pool.apply_async(gen, (raw,))
+
+            elif "call" in schema:
+                for x in args:
+                    decompress(x, project, pool)
+                for x in schema.get("kwargs", {}).values():
+                    decompress(x, project, pool)
+
+            elif "list" in schema or "tuple" in schema:
+                for x in schema.get("list", schema.get("tuple")):
+                    decompress(x, project, pool)
+
+            elif "dict" in schema:
+                for x in schema["dict"].values():
+                    decompress(x, project, pool)
+
+            elif "pairs" in schema:
+                for n, x in schema["pairs"]:
+                    if not project or columns is None or n in columns:
+                        decompress(x, False, pool)
+
+    def unfill(schema, project=True):
+        # project: columns selection still applies (we haven't passed through the outermost Table yet)
+        if isinstance(schema, dict):
+            if id(schema) in decompressing:
+                out = decompressing.pop(id(schema)).get()
+
+            elif "call" in schema and isinstance(schema["call"], list) and len(schema["call"]) > 0:
                 gen = spec2function(schema["call"], awkwardlib=awkwardlib, whitelist=whitelist)
-                args = [unfill(x) for x in schema.get("args", [])]
+                args = [unfill(x, project) for x in schema.get("args", [])]
 
                 kwargs = {}
                 if schema.get("cacheable", False):
@@ -406,7 +676,7 @@ def deserialize(storage, name="", awkwardlib="awkward", whitelist=whitelist, cac
                 if schema.get("whitelistable", False):
                     kwargs["whitelist"] = whitelist
                 if "kwargs" in schema:
-                    kwargs.update({n: unfill(x) for n, x in schema["kwargs"].items()})
+                    kwargs.update({n: unfill(x, project) for n, x in schema["kwargs"].items()})
 
                 out = gen(*args, **kwargs)
 
@@ -417,16 +687,19 @@ def deserialize(storage, name="", awkwardlib="awkward", whitelist=whitelist, cac
                     out = storage[prefix + schema["read"]]
 
             elif "list" in schema:
-                out = [unfill(x) for x in schema["list"]]
+                out = [unfilllazy(x, project) for x in schema["list"]]
 
             elif "tuple" in schema:
-                out = tuple(unfill(x) for x in schema["tuple"])
+                out = tuple(unfill(x, project) for x in schema["tuple"])
 
             elif "dict" in schema:
-                out = {n: unfill(x) for n, x in schema["dict"].items()}
+                out = {n: unfill(x, project) for n, x in schema["dict"].items()}
 
             elif "pairs" in schema:
-                out = [(n, unfill(x)) for n, x in schema["pairs"]]
+                if project and columns is not None:
+                    out = [(n, unfilllazy(x, False)) for n, x in schema["pairs"] if n in columns]
+                else:
+                    out = [(n, unfilllazy(x, False)) for n, x in schema["pairs"]]
 
             elif "dtype" in schema:
                 out = json2dtype(schema["dtype"])
@@ -443,6 +716,8 @@ def deserialize(storage, name="", awkwardlib="awkward", whitelist=whitelist, cac
             elif "ref" in schema:
                 if schema["ref"] in seen:
                     out = seen[schema["ref"]]
+                elif schema["ref"] in nodes:
+                    out = awkward.array.virtual.VirtualArray(unfillref, (schema["ref"],))
                 else:
                     out = awkward.array.virtual.VirtualArray(lambda: seen[schema["ref"]])
 
@@ -459,7 +734,16 @@ def deserialize(storage, name="", awkwardlib="awkward", whitelist=whitelist, cac
         else:
             raise ValueError("unrecognized JSON object: {0}".format(repr(schema)))
 
-    return unfill(schema["schema"])
+    if threads is not None and threads > 1 and not lazy:
+        pool = multiprocessing.pool.ThreadPool(threads)
+        try:
+            decompress(schema["schema"], pool=pool)
+            return unfill(schema["schema"])
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        return unfill(schema["schema"])
 
 def keys(storage, name="", subschemas=True):
     schema = storage[name]
@@ -568,6 +852,16 @@ def save(file, array, name=None, mode="a", **options):
             self.f = f
         def __setitem__(self, where, what):
             self.f.writestr(where, what, compress_type=zipfile.ZIP_STORED)
+        def writeiter(self, where, chunks, nbytes):
+            # stream buffers into the zipfile rather than joining them into one bytes object
+            if sys.version_info[0] < 3 or sys.version_info[:2] < (3, 6):
+                chunks = list(chunks)
+                self.f.writestr(where, chunks[0] if len(chunks) == 1 else b"".join(chunks), compress_type=zipfile.ZIP_STORED)
+            else:
+                # deflate can expand incompressible data slightly
+                with self.f.open(where, mode="w", force_zip64=(nbytes + nbytes // 100 + 1024 > zipfile.ZIP64_LIMIT)) as dest:
+                    for chunk in chunks:
+                        dest.write(chunk)
 
     with zipfile.ZipFile(file, mode=mode, compression=zipfile.ZIP_STORED) as f:
         namelist = f.namelist()
@@ -583,28 +877,54 @@ def load(file, **options):
     f = Load(file, **options)
     if list(f) == [""]:
         out = f[""]
-        f.close()
+        if not f.options["lazy"]:
+            f.close()
         return out
     else:
         return f
 
 class Load(Mapping):
     def __init__(self, file, **options):
+        alloptions = {"schemasuffix": ".json", "awkwardlib": "awkward", "whitelist": whitelist, "cache": None, "lazy": False, "columns": None, "memmap": True, "threads": None}
+        alloptions.update(options)
+        self.schemasuffix = alloptions.pop("schemasuffix")
+        self.options = alloptions
+
+        memmap = self.options["memmap"] and isinstance(file, str)
+
         class Wrap(object):
             def __init__(self):
                 self.f = zipfile.ZipFile(file, mode="r")
+                self.m = None
             def __getitem__(self, where):
+                if memmap:
+                    info = self.f.getinfo(where)
+                    # uncompressed, unencrypted members are read-only views of a shared memory map: no copy
+                    if info.compress_type == zipfile.ZIP_STORED and info.flag_bits & 0x01 == 0 and info.file_size > 0:
+                        if self.m is None:
+                            self.m = numpy.memmap(file, dtype=numpy.uint8, mode="r")
+                        # the local header's extra field may differ from the central directory's
+                        header = self.m[info.header_offset : info.header_offset + 30].tostring()
+                        if header[:4] != zipfile.stringFileHeader:
+                            raise zipfile.BadZipfile("bad magic number for file header of {0}".format(repr(where)))
+                        namelength, extralength = struct.unpack("<HH", header[26:30])
+                        start = info.header_offset + 30 + namelength + extralength
+                        return self.m[start : start + info.file_size]
                 return self.f.read(where)
 
         self._file = Wrap()
 
-        alloptions = {"schemasuffix": ".json", "awkwardlib": "awkward", "whitelist": whitelist, "cache": None}
-        alloptions.update(options)
-        self.schemasuffix = alloptions.pop("schemasuffix")
-        self.options = alloptions
+        # cache keys are shared only if they identify the data: a path, as of its modification time and size;
+        # file-like objects get transient keys
+        if isinstance(file, str):
+            stat = os.stat(file)
+            self._keyprefix = "{0}:{1}:{2}:".format(os.path.abspath(file), stat.st_mtime, stat.st_size)
+        else:
+            self._keyprefix = None
 
     def __getitem__(self, where):
-        return deserialize(self._file, name=where + self.schemasuffix, awkwardlib=self.options["awkwardlib"], whitelist=self.options["whitelist"], cache=self.options["cache"])
+        keyprefix = None if self._keyprefix is None else self._keyprefix + where + ":"
+        return deserialize(self._file, name=where + self.schemasuffix, awkwardlib=self.options["awkwardlib"], whitelist=self.options["whitelist"], cache=self.options["cache"], lazy=self.options["lazy"], columns=self.options["columns"], keyprefix=keyprefix, threads=self.options["threads"])
 
     def __iter__(self):
         for n in self._file.f.namelist():
@@ -623,9 +943,12 @@ class Load(Mapping):
 
     def close(self):
         self._file.f.close()
+        self._file.m = None
 
     def __del__(self):
-        self.close()
+        # lazy arrays still read from the file; it closes when they are all gone
+        if not self.options["lazy"]:
+            self.close()
 
     def __enter__(self, *args, **kwds):
         return self
@@ -635,7 +958,7 @@ class Load(Mapping):
 
 class hdf5(MutableMapping):
     def __init__(self, group, **options):
-        alloptions = {"compression": compression, "awkwardlib": "awkward", "whitelist": whitelist, "cache": None}
+        alloptions = {"compression": compression, "awkwardlib": "awkward", "whitelist": whitelist, "cache": None, "lazy": False, "columns": None, "threads": None}
         alloptions.update(options)
         self.options = alloptions
         self.options["delimiter"] = "/"
@@ -648,11 +971,14 @@ class hdf5(MutableMapping):
                 return self.g[where][()]
             def __setitem__(self, where, what):
                 self.g[where] = numpy.frombuffer(what, dtype=numpy.uint8)
+            def writeiter(self, where, chunks, nbytes):
+                chunks = list(chunks)
+                self[where] = chunks[0] if len(chunks) == 1 else b"".join(chunks)
 
         self._group = Wrap()
 
     def __getitem__(self, where):
-        return deserialize(self._group, name=where + self.options["schemasuffix"], awkwardlib=self.options["awkwardlib"], whitelist=self.options["whitelist"], cache=self.options["cache"])
+        return deserialize(self._group, name=where + self.options["schemasuffix"], awkwardlib=self.options["awkwardlib"], whitelist=self.options["whitelist"], cache=self.options["cache"], lazy=self.options["lazy"], columns=self.options["columns"], keyprefix="{0}:{1}:".format(self._group.g.file.filename, self._group.g[where].name), threads=self.options["threads"])
 
     def __setitem__(self, where, what):
         options = dict(self.options)
@@ -662,6 +988,10 @@ class hdf5(MutableMapping):
             del options["whitelist"]
         if "cache" in options:
             del options["cache"]
+        if "lazy" in options:
+            del options["lazy"]
+        if "columns" in options:
+            del options["columns"]
         self._group.g.create_group(where)
         serialize(what, self._group, name=where, **options)
 
@@ -336,10 +336,10 @@ class ArrayType(Type):
     def _eq(self, other, seen, ignoremask=False):
         if self is other:
             return True
-        elif id(self) in seen:
-            return False
+        elif (id(self), id(other)) in seen:
+            return True    # already being compared: a shared or recursive subtype is equal unless something else differs
         else:
-            seen.add(id(self))
+            seen.add((id(self), id(other)))
             if isinstance(other, ArrayType) and self._takes == other._takes:
                 if isinstance(self._to, Type):
                     return self._to._eq(other._to, seen, ignoremask=ignoremask)
@@ -430,10 +430,10 @@ class TableType(Type):
     def _eq(self, other, seen, ignoremask=False):
         if self is other:
             return True
-        elif id(self) in seen:
-            return False
+        elif (id(self), id(other)) in seen:
+            return True    # already being compared: a shared or recursive subtype is equal unless something else differs
         else:
-            seen.add(id(self))
+            seen.add((id(self), id(other)))
             if isinstance(other, TableType) and sorted(self._fields) == sorted(other._fields):
                 for n in self._fields:
                     if isinstance(self._fields[n], Type):
@@ -511,10 +511,10 @@ class UnionType(Type):
     def _eq(self, other, seen, ignoremask=False):
         if self is other:
             return True
-        elif id(self) in seen:
-            return False
+        elif (id(self), id(other)) in seen:
+            return True    # already being compared: a shared or recursive subtype is equal unless something else differs
         else:
-            seen.add(id(self))
+            seen.add((id(self), id(other)))
             if isinstance(other, UnionType) and len(self._possibilities) == len(other._possibilities):
                 for x, y in zip(sorted(self._possibilities), sorted(self._possibilities)):
                     if isinstance(x, Type):
@@ -592,10 +592,10 @@ class OptionType(Type):
     def _eq(self, other, seen, ignoremask=False):
         if self is other:
             return True
-        elif id(self) in seen:
-            return False
+        elif (id(self), id(other)) in seen:
+            return True    # already being compared: a shared or recursive subtype is equal unless something else differs
         else:
-            seen.add(id(self))
+            seen.add((id(self), id(other)))
             if isinstance(other, OptionType):
                 if isinstance(self._type, Type) and self._type._eq(other._type, seen, ignoremask=ignoremask):
                     return True
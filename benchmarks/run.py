@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2019, IRIS-HEP
+# All rights reserved.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# 
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# 
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Timings behind the performance figures quoted in commit messages.
+
+    PYTHONPATH=. python benchmarks/run.py [CASE ...]
+
+Run it at two commits to compare them. Memory is the peak traced by tracemalloc during the measured call.
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+import numpy
+
+import awkward
+import awkward.persist
+import awkward.type
+from awkward import JaggedArray, StringArray, Table, VirtualArray
+
+random = numpy.random.RandomState(12345)
+
+def measure(fcn, repeat=3):
+    best = None
+    for i in range(repeat):
+        tracemalloc.start()
+        start = timeit.default_timer()
+        fcn()
+        seconds = timeit.default_timer() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        best = (seconds, peak) if best is None else min(best, (seconds, peak))
+    return "{0:.3f} s, {1:.0f} MB".format(best[0], best[1] / 1e6)
+
+def jagged(counts):
+    return JaggedArray.fromcounts(counts, random.normal(0, 1, counts.sum()))
+
+def poisson_and_skewed(numrows=1000000):
+    skewed = random.poisson(1, numrows)
+    skewed[random.randint(0, numrows, 10)] = 200000
+    return [("Poisson(5)", jagged(random.poisson(5, numrows))), ("skewed", jagged(skewed))]
+
+def parents():
+    for exp in range(5, 8):
+        counts = random.poisson(3, 2 * 10**exp)
+        a = JaggedArray.fromcounts(counts, numpy.arange(counts.sum()))[::2]
+        order = random.permutation(len(a))
+        for name, starts, stops in [("disjoint", a.starts, a.stops), ("shuffled", a.starts[order], a.stops[order]), ("overlapping", a.starts, a.stops + 2)]:
+            yield "1e{0} rows {1}".format(exp, name), measure(lambda: JaggedArray.startsstops2parents(starts, stops))
+
+def save():
+    table = Table(x=random.normal(0, 1, 2500000), n=numpy.arange(2500000))
+    filename = os.path.join(tempfile.mkdtemp(), "bench.awkd")
+    for name, options in [("zlib", {}), ("uncompressed", {"compression": None})]:
+        yield "40 MB Table " + name, measure(lambda: awkward.save(filename, table, mode="w", **options), repeat=1)
+    os.remove(filename)
+
+def compression():
+    for name, counts in [("Poisson(5)", random.poisson(5, 1000000)), ("regular", numpy.full(1000000, 5))]:
+        a = JaggedArray.fromcounts(counts, numpy.zeros(counts.sum()))
+        for filters in [[], ["delta"], ["delta", "shuffle"]]:
+            storage = {}
+            for n, x in [("starts", a.starts), ("stops", a.stops)]:
+                awkward.persist.serialize(x, storage, name=n, compression={"filters": filters, "pair": awkward.persist.zlib.compress})
+            nbytes = sum(len(x) for n, x in storage.items() if n not in ("starts", "stops"))
+            yield "{0} zlib {1}".format(name, "+".join(filters) or "-"), "{0:.3f} MB".format(nbytes / 1e6)
+
+def virtualtype():
+    table = Table(x=JaggedArray.fromcounts([2, 0, 1, 3], numpy.arange(6.0)), y=numpy.arange(4))
+    tpe = awkward.type.fromarray(table)
+    generate = lambda: table
+    VirtualArray(generate, type=tpe).materialize()
+    arrays = [VirtualArray(generate, type=tpe) for i in range(10000)]
+    start = timeit.default_timer()
+    for x in arrays:
+        x.materialize()
+    yield "materialize, small Table", "{0:.1f} us".format(1e6 * (timeit.default_timer() - start) / len(arrays))
+
+def argminmax():
+    a = jagged(random.poisson(5, 3000000))
+    yield "3e6 sublists argmin", measure(a.argmin)
+    yield "3e6 sublists argmin, not compact", measure(a[::2].argmin)
+
+def sort():
+    a = jagged(random.poisson(5, 1000000))
+    yield "sort(ascending=False)", measure(lambda: a.sort(ascending=False))
+    yield "lexsort((-content, parents))", measure(lambda: JaggedArray.fromcounts(a.counts, a.content[numpy.lexsort((-a.content, a.parents))]))
+
+def median():
+    for name, a in poisson_and_skewed():
+        yield name + " median", measure(a.median)
+        yield name + " lexsort((content, parents))", measure(lambda: numpy.lexsort((a.content, a.parents)))
+
+def topk():
+    for name, a in poisson_and_skewed():
+        yield name + " topk(2)", measure(lambda: a.topk(2))
+        yield name + " argsort + [:, :2]", measure(lambda: a[a.argsort(ascending=False)][:, :2])
+
+def unique():
+    vocabulary = [bytes(random.randint(97, 123, random.randint(3, 9)).astype(numpy.uint8)) for i in range(1000)]
+    for name, numwords, longlengths in [("1e6 short words", 1000000, []), ("2e5 short words + one 1 MB string", 200000, [1000000])]:
+        words = [vocabulary[i] for i in random.randint(0, len(vocabulary), numwords)]
+        for i, n in zip(random.randint(0, numwords, len(longlengths)), longlengths):
+            words[i] = bytes(random.randint(97, 100, n).astype(numpy.uint8))
+        strings = StringArray.fromcounts([len(x) for x in words], numpy.frombuffer(b"".join(words), dtype=numpy.uint8))
+        a = JaggedArray.fromcounts(numpy.full(numwords // 10, 10), strings)
+        yield name, measure(a.unique, repeat=1)
+
+def combinations():
+    counts = random.poisson(5.5, 100000)
+    jets = JaggedArray.fromcounts(counts, Table(**dict(("c{0}".format(i), random.normal(0, 1, counts.sum())) for i in range(50))))
+    def run():
+        pairs = jets.distincts()
+        return [getattr(pairs, side)[column] for i in range(5) for side in ["i0", "i1"] for column in ["c0", "c1", "c2"]]
+    yield "distincts of 50 columns, 3 + 3 read 5 times", measure(run, repeat=1)
+
+def evaluate():
+    counts = random.poisson(5, 2000000)
+    px, py = jagged(counts), jagged(counts)
+    fcn = lambda px, py: numpy.sqrt(px**2 + py**2) > 20
+    yield "ufuncs", measure(lambda: fcn(px, py), repeat=1)
+    yield "awkward.evaluate", measure(lambda: awkward.evaluate(fcn, px, py), repeat=1)
+
+cases = [parents, save, compression, virtualtype, argminmax, sort, median, topk, unique, combinations, evaluate]
+
+if __name__ == "__main__":
+    for case in cases:
+        if len(sys.argv) <= 1 or case.__name__ in sys.argv[1:]:
+            for name, result in case():
+                print("{0:>12s} {1:>48s}: {2}".format(case.__name__, name, result))
@@ -447,3 +447,88 @@ def test_arrow_writeparquet2(tmpdir):
     assert isinstance(c.chunks[0]["x"].content.content, awkward.BitMaskedArray) and isinstance(d.chunks[0]["x"].content.content, awkward.BitMaskedArray)
     assert c.chunks[0]["x"].content.content.boolmask().tolist() == d.chunks[0]["x"].content.content.boolmask().tolist()
     assert isinstance(c.chunks[0]["x"].content.content.content, numpy.ndarray) and isinstance(d.chunks[0]["x"].content.content.content, numpy.ndarray)
+
+def test_arrow_readparquet_filters(tmpdir):
+    if pyarrow is None:
+        pytest.skip("unable to import pyarrow")
+    else:
+        filename = os.path.join(str(tmpdir), "tmp.parquet")
+
+    a = awkward.ChunkedArray([awkward.Table(met=numpy.arange(i * 10, i * 10 + 10, dtype=numpy.float64), n=numpy.arange(10)) for i in range(5)])
+    awkward.toparquet(a, filename)
+
+    b = awkward.fromparquet(filename, filters=[("met", ">", 25)])
+    assert len(b.chunks) == 3
+    assert b["met"].tolist() == list(range(20, 50))
+
+    b = awkward.fromparquet(filename, filters=[[("met", "<", 5)], [("met", ">=", 40), ("n", "in", [3, 4])]])
+    assert b["met"].tolist() == list(range(0, 10)) + list(range(40, 50))
+
+    assert len(awkward.fromparquet(filename, filters=[("met", "==", 100)]).chunks) == 0
+    assert len(awkward.fromparquet(filename, filters=[("met", "!=", 100), ("missing", "<", 0)]).chunks) == 5
+
+def test_arrow_readparquet_coalesced(tmpdir):
+    if pyarrow is None:
+        pytest.skip("unable to import pyarrow")
+    else:
+        filename = os.path.join(str(tmpdir), "tmp.parquet")
+
+    a = awkward.ChunkedArray([awkward.Table(**{"c{0}".format(j): numpy.arange(10.0) + i + j for j in range(5)}) for i in range(4)])
+    awkward.toparquet(a, filename)
+
+    cache = {}
+    b = awkward.fromparquet(filename, cache=cache)
+    parquetfile = b.chunks[0].contents["c0"].generator
+    for i, chunk in enumerate(b.chunks):
+        assert chunk["c0"].tolist() == a.chunks[i]["c0"].tolist()
+        assert (parquetfile.key(i, "c3") in cache) == (i > 0)
+        assert chunk["c3"].tolist() == a.chunks[i]["c3"].tolist()
+    assert sorted(cache) == sorted(parquetfile.key(i, n) for i in range(4) for n in ("c0", "c3"))
+
+    import multiprocessing.pool
+    cache = {}
+    b = awkward.fromparquet(filename, cache=cache)
+    pool = multiprocessing.pool.ThreadPool(8)
+    try:
+        out = pool.map(lambda x: b.chunks[x % 4]["c{0}".format(x % 5)].tolist(), range(40))
+    finally:
+        pool.close()
+        pool.join()
+    assert out == [a.chunks[x % 4]["c{0}".format(x % 5)].tolist() for x in range(40)]
+
+    # a file rewritten at the same path gets new keys, so a shared cache doesn't serve stale columns
+    cache = {}
+    assert awkward.fromparquet(filename, cache=cache).chunks[0]["c0"].tolist() == a.chunks[0]["c0"].tolist()
+    awkward.toparquet(awkward.Table(c0=numpy.arange(5.0) + 100), filename)
+    assert awkward.fromparquet(filename, cache=cache).chunks[0]["c0"].tolist() == [100.0, 101.0, 102.0, 103.0, 104.0]
+
+def test_arrow_readparquet_filelike_cache(tmpdir):
+    if pyarrow is None:
+        pytest.skip("unable to import pyarrow")
+
+    import io
+    cache = {}
+    for i in range(40):
+        buf = io.BytesIO()
+        a = awkward.ChunkedArray([awkward.Table(c0=numpy.full(2, 10.0*i), c1=numpy.full(2, 10.0*i + 1)), awkward.Table(c0=numpy.full(2, 10.0*i), c1=numpy.full(2, 10.0*i + 1))])
+        awkward.toparquet(a, buf)
+        b = awkward.fromparquet(io.BytesIO(buf.getvalue()), cache=cache)
+        assert b["c0"].tolist() == [10.0*i] * 4
+        assert b["c1"].tolist() == [10.0*i + 1] * 4
+        del a, b
+    assert not any(isinstance(x, str) for x in cache)
+
+def test_arrow_readparquet_iterchunks_evicts(tmpdir):
+    if pyarrow is None:
+        pytest.skip("unable to import pyarrow")
+    else:
+        filename = os.path.join(str(tmpdir), "tmp.parquet")
+
+    a = awkward.ChunkedArray([awkward.Table(**{"c{0}".format(j): numpy.arange(10.0) + i + j for j in range(5)}) for i in range(20)])
+    awkward.toparquet(a, filename)
+
+    cache = {}
+    b = awkward.fromparquet(filename, cache=cache)
+    for i, chunk in enumerate(b.iterchunks(columns=["c0", "c1", "c2"], prefetch=2)):
+        assert chunk["c2"].tolist() == a.chunks[i]["c2"].tolist()
+    assert len(cache) == 0
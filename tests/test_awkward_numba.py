@@ -60,6 +60,10 @@ class Test(unittest.TestCase):
         b = awkward_numba.JaggedArray([1, 4, 4, 6], [4, 4, 6, 11], [999, 0.0, 1.1, 2.2, 3.3, 4.4, 5.5, 6.6, 7.7, 8.8, 9.9])
         assert isinstance(a + b, awkward_numba.array.jagged.JaggedArrayNumba)
 
+    def test_awkward_numba_startsstops2parents(self):
+        assert awkward_numba.JaggedArray.startsstops2parents(numpy.array([5, 0, 8]), numpy.array([7, 2, 10])).tolist() == [1, 1, -1, -1, -1, 0, 0, -1, 2, 2]
+        assert awkward_numba.JaggedArray.startsstops2parents(numpy.array([0, 2, 1]), numpy.array([4, 3, 2])).tolist() == [0, 2, 1, 0]
+
     def test_awkward_numba_argmin(self):
         a = awkward_numba.JaggedArray([0, 3, 3, 5], [3, 3, 5, 10], [0.0, 1.1, 2.2, 3.3, 4.4, 5.5, 6.6, 7.7, 8.8, 9.9])
         assert isinstance(a.argmin(), awkward_numba.array.jagged.JaggedArrayNumba)
@@ -77,3 +81,53 @@ class Test(unittest.TestCase):
         a = awkward_numba.JaggedArray([[0, 3], [3, 5]], [[3, 3], [5, 10]], [0.0, 1.1, 2.2, 3.3, 4.4, 5.5, 6.6, 7.7, 8.8, 9.9])
         assert isinstance(a.argmin(), awkward_numba.array.jagged.JaggedArrayNumba)
         assert a.argmax().tolist() == [[[2], []], [[1], [4]]]
+
+    def test_awkward_numba_jagged_njit(self):
+        import numba
+
+        @numba.njit
+        def total(a):
+            out = 0.0
+            for x in a:
+                for y in x:
+                    out += y
+            return out
+
+        @numba.njit
+        def pieces(a):
+            return len(a), a[-1], a[1:], a.starts, a.stops, a.content
+
+        a = awkward_numba.JaggedArray.fromcounts([3, 0, 2], [1.1, 2.2, 3.3, 4.4, 5.5])
+        assert abs(total(a) - 16.5) < 1e-12
+        assert abs(total(a[[True, False, True]]) - 16.5) < 1e-12
+
+        length, last, tail, starts, stops, content = pieces(a)
+        assert length == 3
+        assert last.tolist() == [4.4, 5.5]
+        assert isinstance(tail, awkward_numba.array.jagged.JaggedArrayNumba)
+        assert tail.tolist() == [[], [4.4, 5.5]]
+        assert starts.tolist() == [0, 3, 3]
+        assert stops.tolist() == [3, 3, 5]
+        assert content is a.content
+
+    def test_awkward_numba_jagged_njit_nested(self):
+        import numba
+
+        @numba.njit
+        def total(a):
+            out = 0
+            for x in a:
+                for y in x:
+                    for z in y:
+                        out += z
+            return out
+
+        @numba.njit
+        def getitem(a, i, j):
+            return a[i][j]
+
+        a = awkward_numba.JaggedArray.fromcounts([2, 0, 1], awkward_numba.JaggedArray.fromcounts([2, 1, 3], [1, 2, 3, 4, 5, 6]))
+        assert total(a) == 21
+        assert getitem(a, 0, 1).tolist() == [3]
+        assert getitem(a, -1, 0).tolist() == [4, 5, 6]
+        self.assertRaises(IndexError, lambda: getitem(a, 3, 0))
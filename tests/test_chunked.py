@@ -32,6 +32,7 @@ import unittest
 
 import numpy
 
+import awkward.type
 from awkward import *
 
 class Test(unittest.TestCase):
@@ -250,3 +251,77 @@ class Test(unittest.TestCase):
         assert [a[i] for i in range(len(a))] == [0.0, 1.1, 2.2, 3.3, 4.4, 5.5, 6.6, 7.7, 8.8, 9.9]
         assert len(a.chunks) == 4
         assert a.offsets.tolist() == [0, 3, 6, 9, 10]
+
+    def test_chunked_executor(self):
+        import multiprocessing.pool
+        pool = multiprocessing.pool.ThreadPool(4)
+        try:
+            a = ChunkedArray([numpy.arange(i, i + 10, dtype=numpy.float64) for i in range(0, 100, 10)] + [numpy.array([])])
+            assert a.sum(executor=pool) == a.sum() == 4950
+            assert a.min(executor=pool) == 0 and a.max(executor=pool) == 99
+            assert (a * 2).tolist() == [2.0 * x for x in range(100)]
+
+            b = ChunkedArray([JaggedArray.fromcounts([2, 0, 1], [1, 2, 3]), JaggedArray.fromcounts([1, 1], [4, 5])])
+            assert b.sum(executor=pool).tolist() == [3, 0, 3, 4, 5]
+
+            ChunkedArray.executor = pool
+            try:
+                assert (a + a).tolist() == [2.0 * x for x in range(100)]
+                assert isinstance(a + a, ChunkedArray) and len((a + a).chunks) == 11
+                assert a.prod() == 0
+                assert (b + 1).tolist() == [[2, 3], [], [4], [5], [6]]
+            finally:
+                ChunkedArray.executor = None
+        finally:
+            pool.close()
+
+    def test_chunked_moments(self):
+        a = ChunkedArray([[1.0, 2.0, 3.0], [], [4.0, 5.0], [6.0]])
+        w = ChunkedArray([[1.0, 1.0, 2.0], [], [0.0, 1.0], [3.0]])
+        flat = numpy.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        assert a.mean() == 3.5
+        assert numpy.allclose(a.var(ddof=1), numpy.var(flat, ddof=1))
+        assert numpy.allclose(a.std(), numpy.std(flat))
+        assert numpy.allclose(a.moment(3), (flat**3).mean())
+        assert numpy.allclose(a.mean(weight=w), numpy.average(flat, weights=[1, 1, 2, 0, 1, 3]))
+        assert a.median() == 3.5
+        assert numpy.allclose(a.quantile(0.3), numpy.percentile(flat, 30))
+        self.assertRaises(ValueError, lambda: a.mean(weight=ChunkedArray([[1.0, 1.0], [1.0, 1.0, 1.0, 1.0]])))
+
+        a = ChunkedArray([JaggedArray.fromcounts([2, 0], [1.0, 3.0]), JaggedArray.fromcounts([3], [1.0, 2.0, 6.0])])
+        assert numpy.allclose(a.mean(), [2.0, numpy.nan, 3.0], equal_nan=True)
+        assert numpy.allclose(a.var(), [1.0, numpy.nan, 14.0 / 3], equal_nan=True)
+        assert numpy.allclose(a.median(), [2.0, numpy.nan, 2.0], equal_nan=True)
+
+    def test_chunked_agg(self):
+        a = ChunkedArray([JaggedArray.fromcounts([2, 0], [1.0, 3.0]), JaggedArray.fromcounts([3], [1.0, 2.0, 6.0])])
+        assert a.agg(["sum", "max"]).tolist() == [{"sum": 4.0, "max": 3.0}, {"sum": 0.0, "max": -numpy.inf}, {"sum": 9.0, "max": 6.0}]
+        assert a.describe()["count"].tolist() == [2, 0, 3]
+        self.assertRaises(TypeError, lambda: ChunkedArray([[1.0, 2.0]]).agg(["sum"]))
+
+    def test_chunked_iterchunks(self):
+        cache = {}
+        def make(i):
+            return numpy.arange(i, i + 10, dtype=numpy.float64)
+        def column(i, name):
+            return VirtualArray(make, (i,), cache=cache if name == "x" else None, persistentkey="{0}{1}".format(name, i), type=awkward.type.ArrayType(10, numpy.dtype(numpy.float64)))
+        a = ChunkedArray([Table(x=column(i, "x"), y=column(i, "y")) for i in range(0, 100, 10)], [10] * 10)
+
+        for prefetch in 0, 1, 4:
+            out = []
+            for chunk in a.iterchunks(columns="x", prefetch=prefetch):
+                assert chunk.columns == ["x"]
+                assert isinstance(chunk.contents["x"], numpy.ndarray)
+                assert len(cache) <= prefetch + 1
+                out.extend(chunk["x"].tolist())
+            assert out == list(range(100))
+            assert len(cache) == 0
+            assert not any(x.contents["x"].ismaterialized or x.contents["y"].ismaterialized for x in a.chunks)
+
+        assert [x.tolist() for x in a.iterchunks(prefetch=2)] == [x.tolist() for x in a.chunks]
+        cache.clear()
+
+        iterator = a.iterchunks(prefetch=3)
+        next(iterator)
+        iterator.close()
+        assert len(cache) == 0
@@ -29,6 +29,7 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import unittest
+import warnings
 
 import numpy
 
@@ -79,6 +80,27 @@ class Test(unittest.TestCase):
         self.assertEqual(a.starts.tolist(), [0, 2, 3, 4, 7, 9])
         self.assertEqual(a.stops.tolist(), [2, 3, 4, 7, 9, 10])
 
+    def test_jagged_startsstops2parents(self):
+        assert JaggedArray.startsstops2parents(numpy.array([0, 3, 3, 5]), numpy.array([3, 3, 5, 10])).tolist() == [0, 0, 0, 2, 2, 3, 3, 3, 3, 3]
+        assert JaggedArray.startsstops2parents(numpy.array([5, 0, 8]), numpy.array([7, 2, 10])).tolist() == [1, 1, -1, -1, -1, 0, 0, -1, 2, 2]
+        assert JaggedArray.startsstops2parents(numpy.array([0, 2, 1]), numpy.array([4, 3, 2])).tolist() == [0, 2, 1, 0]
+        assert JaggedArray.startsstops2parents(numpy.array([1, 4]), numpy.array([3, 4, 6])).tolist() == [-1, 0, 0, -1, -1, -1]
+
+        numpy.random.seed(0)
+        for overlap in [0, 3]:
+            starts = numpy.random.randint(0, 1000, 300)
+            stops = starts + numpy.random.randint(0, 5, 300) + overlap
+            if overlap == 0:
+                starts, stops = starts * 10, starts * 10 + stops - starts
+            expected = numpy.full(stops.max(), -1)
+            for i in range(len(starts)):
+                expected[starts[i]:stops[i]] = i
+            assert JaggedArray.startsstops2parents(starts, stops).tolist() == expected.tolist()
+
+        a = JaggedArray([5, 0, 8], [7, 2, 10], [0.0, 1.1, 2.2, 3.3, 4.4, 5.5, 6.6, 7.7, 8.8, 9.9])
+        assert a.parents.tolist() == [1, 1, -1, -1, -1, 0, 0, -1, 2, 2]
+        assert a.compact().tolist() == [[5.5, 6.6], [0.0, 1.1], [8.8, 9.9]]
+
     def test_jagged_str(self):
         pass
 
@@ -152,6 +174,17 @@ class Test(unittest.TestCase):
                 for step in None, 1, 2, 3, 4, 5, -1, -2, -3, -4, -5:
                     assert a[:, start:stop:step].tolist() == [x.tolist()[start:stop:step] for x in a]
 
+    def test_jagged_subslice_nested(self):
+        a = fromiter([[[0, 1, 2], [], [3, 4]], [], [[5], [6, 7, 8, 9]]])
+        assert a[:, 1:].tolist() == [[[], [3, 4]], [], [[6, 7, 8, 9]]]
+        assert a[:, :, 1:].tolist() == [[[1, 2], [], [4]], [], [[], [7, 8, 9]]]
+        assert a[:, ::-1, ::2].tolist() == [[[3], [], [0, 2]], [], [[6, 8], [5]]]
+        assert a[:, 2:, -1].tolist() == [[4], [], []]
+
+        a = JaggedArray.fromcounts([1, 1000000], numpy.arange(1000001))
+        assert a[:, 1:3].tolist() == [[], [2, 3]]
+        assert a[:, 2:6:2].tolist() == [[], [3, 5]]
+
     def test_jagged_jagged(self):
         a = JaggedArray.fromoffsets([0, 3, 3, 5], JaggedArray.fromoffsets([0, 3, 3, 8, 10, 10], [0.0, 1.1, 2.2, 3.3, 4.4, 5.5, 6.6, 7.7, 8.8, 9.9]))
         assert [a[i].tolist() for i in range(len(a))] == [[[0.0, 1.1, 2.2], [], [3.3, 4.4, 5.5, 6.6, 7.7]], [], [[8.8, 9.9], []]]
@@ -311,6 +344,85 @@ class Test(unittest.TestCase):
         assert a.distincts(nested=True).tolist() == [[[(1.1, 2.2), (1.1, 3.3)], [(2.2, 3.3)]], [], [[(4.4, 5.5)]]]
         assert a.argdistincts(nested=True).tolist() == [[[(0, 1), (0, 2)], [(1, 2)]], [], [[(0, 1)]]]
 
+    def test_jagged_choose(self):
+        a = awkward.fromiter([[1.1, 2.2, 3.3, 4.4], [], [5.5, 6.6], [7.7, 8.8, 9.9]])
+        assert a.argchoose(3).tolist() == [[(0, 1, 2), (0, 1, 3), (0, 2, 3), (1, 2, 3)], [], [], [(0, 1, 2)]]
+        assert a.choose(3).tolist() == [[(1.1, 2.2, 3.3), (1.1, 2.2, 4.4), (1.1, 3.3, 4.4), (2.2, 3.3, 4.4)], [], [], [(7.7, 8.8, 9.9)]]
+        assert a.argchoose(3, replacement=True).counts.tolist() == [20, 0, 4, 10]
+        assert a[2:].argchoose(3, replacement=True).tolist()[0] == [(0, 0, 0), (0, 0, 1), (0, 1, 1), (1, 1, 1)]
+        assert a.choose(2).tolist() == a.distincts().tolist()
+        assert a.argchoose(2).tolist() == a.argdistincts().tolist()
+        assert a.choose(2, replacement=True).tolist() == a.pairs().tolist()
+        assert a.argchoose(4).counts.tolist() == [1, 0, 0, 0]
+        assert a[:0].argchoose(3).tolist() == []
+        self.assertRaises(ValueError, lambda: a.choose(0))
+
+    def test_jagged_cross_nary(self):
+        a = awkward.fromiter([[1.1, 2.2], [], [3.3]])
+        b = awkward.fromiter([[10, 20], [30], [40]])
+        c = awkward.fromiter([[100], [200], [300, 400]])
+        assert a.cross([b]).tolist() == a.cross(b).tolist()
+        assert a.argcross([b]).tolist() == a.argcross(b).tolist()
+        assert a.cross([b, c]).tolist() == [[(1.1, 10, 100), (1.1, 20, 100), (2.2, 10, 100), (2.2, 20, 100)], [], [(3.3, 40, 300), (3.3, 40, 400)]]
+        assert a.argcross([b, c]).tolist() == [[(0, 0, 0), (0, 1, 0), (1, 0, 0), (1, 1, 0)], [], [(0, 0, 0), (0, 0, 1)]]
+        assert a[1:].cross([b[1:], c[1:]]).tolist() == [[], [(3.3, 40, 300), (3.3, 40, 400)]]
+        self.assertRaises(NotImplementedError, lambda: a.cross([b, c], nested=True))
+
+    def test_jagged_combinations_lazycolumns(self):
+        a = JaggedArray.fromcounts([3, 0, 2], Table(x=[1.0, 2.0, 3.0, 4.0, 5.0], y=[10, 20, 30, 40, 50]))
+        out = a.distincts()
+        left = out._content["0"]._contents
+        assert all(isinstance(x, VirtualArray) and not x.ismaterialized for x in left.values())
+        assert out.i0["x"].tolist() == [[1.0, 1.0, 2.0], [], [4.0]]
+        assert left["x"].ismaterialized and not left["y"].ismaterialized
+        assert out.i1["y"].tolist() == [[20, 30, 30], [], [50]]
+        assert a.cross(a)[2].tolist() == [({"x": 4.0, "y": 40}, {"x": 4.0, "y": 40}), ({"x": 4.0, "y": 40}, {"x": 5.0, "y": 50}), ({"x": 5.0, "y": 50}, {"x": 4.0, "y": 40}), ({"x": 5.0, "y": 50}, {"x": 5.0, "y": 50})]
+
+    def test_jagged_itercombinations(self):
+        a = JaggedArray.fromcounts([3, 0, 2, 4, 1], numpy.arange(10.0))
+        b = JaggedArray.fromcounts([1, 2, 0, 2, 3], numpy.arange(8))
+        for limitbytes in [1, 500, 100*1024**2]:
+            batches = list(a.iterpairs(limitbytes=limitbytes))
+            assert sum([x.tolist() for x in batches], []) == a.pairs().tolist()
+            assert sum([x.tolist() for x in a.iterdistincts(limitbytes=limitbytes, arg=True)], []) == a.argdistincts().tolist()
+            assert sum([x.tolist() for x in a.itercross(b, limitbytes=limitbytes, nested=True)], []) == a.cross(b, nested=True).tolist()
+        assert len(list(a.iterpairs(limitbytes=1))) == 4
+        assert len(list(a.iterpairs())) == 1
+
+        # empty sublists at a batch boundary go with a batch that has combinations
+        for counts in [[5, 0], [0, 5], [0, 3, 0, 0, 2, 0], [2, 0, 0, 1]]:
+            c = JaggedArray.fromcounts(counts, numpy.arange(float(sum(counts))))
+            for limitbytes in [1, 64]:
+                assert sum([x.tolist() for x in c.iterpairs(limitbytes=limitbytes, arg=True)], []) == c.argpairs().tolist()
+                assert sum([x.tolist() for x in c.iterpairs(limitbytes=limitbytes)], []) == c.pairs().tolist()
+                assert sum([x.tolist() for x in c.itercross(c, limitbytes=limitbytes, arg=True)], []) == c.argcross(c).tolist()
+                assert sum([x.tolist() for x in c.itercross(c, limitbytes=limitbytes)], []) == c.cross(c).tolist()
+                assert sum([x.tolist() for x in c.iterdistincts(limitbytes=limitbytes, arg=True)], []) == c.argdistincts().tolist()
+                assert all(len(x.flatten()) > 0 for x in c.iterpairs(limitbytes=limitbytes, arg=True))
+
+        distincts = a.distincts()
+        batches = a.iterdistincts(limitbytes=500, filter=lambda pairs: pairs.i0 + pairs.i1 > 10)
+        assert sum([x.tolist() for x in batches], []) == distincts[distincts.i0 + distincts.i1 > 10].tolist()
+        self.assertRaises(ValueError, lambda: list(a.iterpairs(limitbytes=0)))
+
+    def test_jagged_evaluate(self):
+        px = awkward.fromiter([[3.0, 10.0, 30.0], [], [40.0, 5.0]])
+        py = awkward.fromiter([[4.0, 24.0, 40.0], [], [30.0, 12.0]])
+        fcn = lambda px, py: numpy.sqrt(px**2 + py**2) > 20
+        assert evaluate(fcn, px, py).tolist() == fcn(px, py).tolist() == [[False, True, True], [], [True, False]]
+        assert evaluate(fcn, px, py, blocksize=2).tolist() == fcn(px, py).tolist()
+        assert evaluate(lambda x, y: x + y, px[1:], py[1:], blocksize=1).tolist() == [[], [70.0, 17.0]]
+
+        weight = numpy.array([1.0, 2.0, 3.0])
+        assert evaluate(lambda x, w, c: x * w + c, px, weight, 1, blocksize=2).tolist() == [[4.0, 11.0, 31.0], [], [121.0, 16.0]]
+
+        a = awkward.fromiter([[[1.0, 2.0], []], [[3.0]]])
+        assert evaluate(lambda x, w: x * w, a, numpy.array([10.0, 100.0])).tolist() == [[[10.0, 20.0], []], [[300.0]]]
+
+        self.assertRaises(ValueError, lambda: evaluate(lambda x, y: x + y, px, awkward.fromiter([[1.0, 2.0, 3.0], [4.0], [5.0, 6.0]])))
+        self.assertRaises(ValueError, lambda: evaluate(lambda x, w: x * w, px, numpy.array([1.0, 2.0])))
+        self.assertRaises(TypeError, lambda: evaluate(lambda x: x, weight))
+
     def test_jagged_sum(self):
         a = JaggedArray([0, 3, 3, 5], [3, 3, 5, 10], [0.0, 1.1, 2.2, 3.3, 4.4, 5.5, 6.6, 7.7, 8.8, 9.9])
         assert a.sum().tolist() == [3.3000000000000003, 0.0, 7.7, 38.5]
@@ -351,6 +463,216 @@ class Test(unittest.TestCase):
         a = JaggedArray([[0, 3], [3, 5]], [[3, 3], [5, 10]], [0.0, 1.1, 2.2, 3.3, 4.4, 5.5, 6.6, 7.7, 8.8, 9.9])
         assert a.argmax().tolist() == [[[2], []], [[1], [4]]]
 
+    def test_jagged_argminmax_general(self):
+        nan, inf = float("nan"), float("inf")
+        a = JaggedArray.fromcounts([3, 0, 2, 4, 1], [2.2, nan, 1.1, inf, -inf, 3.3, 3.3, nan, -1.0, 5.5])
+        assert a.argmin().tolist() == [[1], [], [1], [2], [0]]
+        assert a.argmax().tolist() == [[1], [], [0], [2], [0]]
+
+        a = JaggedArray([5, 0, 3, 3], [7, 3, 3, 5], [3.0, 1.0, 2.0, 9.0, 0.0, 5.0, 4.0])
+        assert a.argmin().tolist() == [[1], [1], [], [1]]
+        assert a.argmax().tolist() == [[0], [0], [], [0]]
+
+        a = JaggedArray.fromcounts([2, 0, 3], [[1, 5], [2, 0], [3, 3], [0, 9], [3, 1]])
+        assert a.argmin().tolist() == [[[0, 1]], [], [[1, 2]]]
+        assert a.argmax().tolist() == [[[1, 0]], [], [[0, 1]]]
+
+        a = JaggedArray.fromcounts([2, 1], JaggedArray.fromcounts([2, 0, 3], [1.1, 0.0, 2.2, 9.9, 3.3]))
+        assert a.argmin().tolist() == [[[1], []], [[0]]]
+        assert a.argmax().tolist() == [[[0], []], [[1]]]
+
+        a = JaggedArray.fromcounts([0, 0], [])
+        assert a.argmin().tolist() == [[], []]
+
+        a = JaggedArray.fromcounts([1, 3], [3.0, 4.0, 5.0, 6.0])[1:]
+        assert a.argmax().tolist() == [[2]]
+        a = JaggedArray.fromcounts([1, 3], [3, 4, 9, 6])[1:]
+        assert a.argmax().tolist() == [[1]]
+        assert a.argmin().tolist() == [[0]]
+
+        a = JaggedArray.fromcounts([2, 3, 0, 2], [5, 1, 3, 9, 4, 7, 8])
+        assert a[[False, True, False, True]].argmax().tolist() == [[1], [1]]
+        assert a[[True, False, True, True]].argmin().tolist() == [[1], [], [0]]
+        a = JaggedArray([5, 0, 2], [7, 2, 2], [5, 1, 3, 9, 4, 7, 8])
+        assert a.argmax().tolist() == [[1], [0], []]
+        assert a.argmin().tolist() == [[0], [1], []]
+
+    def test_jagged_argsort(self):
+        a = JaggedArray.fromcounts([3, 0, 2, 4], [3.3, 1.1, 2.2, 5.5, 4.4, 0.0, 9.9, 0.0, 1.0])
+        assert a.argsort().tolist() == [[1, 2, 0], [], [1, 0], [0, 2, 3, 1]]
+        assert a.argsort(ascending=False).tolist() == [[0, 2, 1], [], [0, 1], [1, 3, 0, 2]]
+        assert a[a.argsort()].tolist() == a.sort().tolist() == [[1.1, 2.2, 3.3], [], [4.4, 5.5], [0.0, 0.0, 1.0, 9.9]]
+
+        a = JaggedArray.fromcounts([5], [1, 2, 1, 2, 1])
+        assert a.argsort(stable=True).tolist() == [[0, 2, 4, 1, 3]]
+        assert a.argsort(ascending=False).tolist() == [[1, 3, 0, 2, 4]]
+
+        a = JaggedArray([5, 0, 3, 3], [7, 3, 3, 5], [3.0, 1.0, 2.0, 9.0, 0.0, 5.0, 4.0])
+        assert a.argsort().tolist() == [[1, 0], [1, 2, 0], [], [1, 0]]
+        assert a.sort().tolist() == [[4.0, 5.0], [1.0, 2.0, 3.0], [], [0.0, 9.0]]
+
+        a = JaggedArray([[0, 2], [3, 3]], [[2, 3], [3, 5]], [1.0, 0.0, 5.0, 2.0, 1.0])
+        assert a.sort().tolist() == [[[0.0, 1.0], [5.0]], [[], [1.0, 2.0]]]
+
+        a = JaggedArray.fromcounts([2, 1], JaggedArray.fromcounts([3, 0, 2], [3, 1, 2, 9, 0]))
+        assert a.argsort().tolist() == [[[1, 2, 0], []], [[1, 0]]]
+        assert a.sort(ascending=False).tolist() == [[[3, 2, 1], []], [[9, 0]]]
+
+        a = JaggedArray.fromcounts([2, 0, 3], Table(pt=[1.0, 5.0, 2.0, 7.0, 3.0], eta=[0, 1, 2, 3, 4]))
+        assert a.argsort(by="pt").tolist() == [[0, 1], [], [0, 2, 1]]
+        assert a.sort(by="pt", ascending=False)["eta"].tolist() == [[1, 0], [], [3, 4, 2]]
+        self.assertRaises(ValueError, lambda: a.sort())
+
+    def test_jagged_moments(self):
+        a = JaggedArray.fromcounts([3, 0, 2, 1], [1.0, 2.0, 6.0, 1e8 + 1, 1e8 + 3, numpy.nan])
+        assert numpy.allclose(a.mean(), [3.0, numpy.nan, 1e8 + 2, numpy.nan], equal_nan=True)
+        assert numpy.allclose(a.var(), [14.0 / 3, numpy.nan, 1.0, numpy.nan], equal_nan=True)
+        assert numpy.allclose(a.var(ddof=1), [7.0, numpy.nan, 2.0, numpy.nan], equal_nan=True)
+        assert numpy.allclose(a.std(), numpy.sqrt([14.0 / 3, numpy.nan, 1.0, numpy.nan]), equal_nan=True)
+        assert numpy.allclose(a[:1].moment(2), [41.0 / 3])
+
+        w = JaggedArray.fromcounts([3, 0, 2, 1], [1.0, 1.0, 2.0, 0.0, 1.0, 1.0])
+        assert numpy.allclose(a.mean(weight=w), [3.75, numpy.nan, 1e8 + 3, numpy.nan], equal_nan=True)
+        assert numpy.allclose(a.var(weight=w)[:1], [numpy.average((numpy.array([1.0, 2.0, 6.0]) - 3.75)**2, weights=[1, 1, 2])])
+        self.assertRaises(ValueError, lambda: a.mean(weight=JaggedArray.fromcounts([2, 1, 2, 1], numpy.ones(6))))
+        self.assertRaises(TypeError, lambda: a.mean(weight=numpy.ones(6)))
+
+        a = JaggedArray.fromcounts([2, 1], JaggedArray.fromcounts([3, 0, 2], [1, 2, 3, 4, 6]))
+        assert numpy.allclose(a.mean().flatten(), [2.0, numpy.nan, 5.0], equal_nan=True)
+        assert a.mean().counts.tolist() == [2, 1]
+
+        a = JaggedArray.fromcounts([2, 1], Table(x=[1.0, 3.0, 5.0], y=[0, 1, 2]))
+        assert a.mean().tolist() == [{"x": 2.0, "y": 0.5}, {"x": 5.0, "y": 2.0}]
+
+        a = JaggedArray.fromcounts([3, 2, 1], MaskedArray([False, True, False, False, False, True], [1.0, 100.0, 3.0, 4.0, 6.0, 7.0]))
+        assert numpy.allclose(a.mean(), [2.0, 5.0, numpy.nan], equal_nan=True)
+        assert numpy.allclose(a.var(), [1.0, 1.0, numpy.nan], equal_nan=True)
+        assert numpy.allclose(a.moment(2), [5.0, 26.0, numpy.nan], equal_nan=True)
+        assert numpy.allclose(a.mean(weight=JaggedArray.fromcounts([3, 2, 1], [1.0, 1.0, 3.0, 1.0, 1.0, 1.0])), [2.5, 5.0, numpy.nan], equal_nan=True)
+        assert numpy.allclose(JaggedArray.fromcounts([3, 2], IndexedMaskedArray([0, -1, 1, 2, -1], [1.0, 3.0, 5.0])).mean(), [2.0, 5.0])
+
+    def test_jagged_quantile(self):
+        a = JaggedArray.fromcounts([4, 0, 1, 3, 2], [4.0, 1.0, 3.0, 2.0, 7.0, 5.0, 5.0, 1.0, 2.0, numpy.nan])
+        assert numpy.allclose(a.median(), [2.5, numpy.nan, 7.0, 5.0, numpy.nan], equal_nan=True)
+        assert numpy.allclose(a.quantile(0), [1.0, numpy.nan, 7.0, 1.0, numpy.nan], equal_nan=True)
+        assert numpy.allclose(a.quantile(1), [4.0, numpy.nan, 7.0, 5.0, numpy.nan], equal_nan=True)
+        assert numpy.allclose(a.quantile(0.25)[:1], [numpy.percentile([4.0, 1.0, 3.0, 2.0], 25)])
+        self.assertRaises(ValueError, lambda: a.quantile(1.5))
+
+        a = JaggedArray.fromcounts([3, 1, 2], [1.0, numpy.inf, 5.0, -numpy.inf, 2.0, numpy.inf])
+        assert a.median().tolist() == [5.0, -numpy.inf, numpy.inf]
+        assert a.quantile(1).tolist() == [numpy.inf, -numpy.inf, numpy.inf]
+
+        a = JaggedArray.fromcounts([3, 2, 1], MaskedArray([False, True, False, False, False, True], [1.0, 100.0, 3.0, 4.0, 6.0, 7.0]))
+        assert numpy.allclose(a.median(), [2.0, 5.0, numpy.nan], equal_nan=True)
+        assert numpy.allclose(a.quantile(1), [3.0, 6.0, numpy.nan], equal_nan=True)
+
+        numpy.random.seed(0)
+        counts = numpy.random.randint(0, 20, 1000)
+        a = JaggedArray.fromcounts(counts, numpy.random.randint(0, 5, counts.sum()))
+        expected = [numpy.percentile(x, 30) if len(x) > 0 else numpy.nan for x in a]
+        assert numpy.allclose(a.quantile(0.3), expected, equal_nan=True)
+
+        a = JaggedArray.fromcounts(counts, numpy.random.normal(0, 1, counts.sum()))
+        for q in [0.1, 0.5, 0.77]:
+            expected = [numpy.percentile(x, 100*q) if len(x) > 0 else numpy.nan for x in a]
+            assert numpy.allclose(a.quantile(q), expected, equal_nan=True)
+
+        assert JaggedArray.fromcounts([], numpy.array([], dtype=numpy.float64)).median().tolist() == []
+
+    def test_jagged_agg(self):
+        a = JaggedArray.fromcounts([3, 0, 2, 1], [1, 2, 6, 0, 3, 5])
+        out = a.agg(["count", "count_nonzero", "sum", "sumsq", "prod", "min", "max", "any", "all"])
+        assert isinstance(out, Table)
+        for n in ["count", "count_nonzero", "sum", "prod", "min", "max", "any", "all"]:
+            assert out[n].tolist() == getattr(a, n)().tolist()
+            assert out[n].dtype == getattr(a, n)().dtype
+        assert out["sumsq"].tolist() == [41, 0, 9, 25]
+
+        out = a.describe()
+        assert out.columns == ["count", "mean", "std", "min", "max"]
+        assert numpy.allclose(out["mean"], [3.0, numpy.nan, 1.5, 5.0], equal_nan=True)
+        assert numpy.allclose(out["std"], numpy.sqrt([14.0 / 3, numpy.nan, 2.25, 0.0]), equal_nan=True)
+        self.assertRaises(ValueError, lambda: a.agg(["sum", "median"]))
+
+        a = JaggedArray.fromcounts([2, 1], JaggedArray.fromcounts([2, 0, 1], [1, 2, 3]))
+        assert a.agg("sum").tolist() == [[{"sum": 3}, {"sum": 0}], [{"sum": 3}]]
+
+        a = JaggedArray.fromcounts([2, 1], MaskedArray([False, True, False], [1.0, 2.0, 3.0]))
+        assert a.agg(["count", "sum", "max"])["sum"].tolist() == a.sum().tolist()
+        assert a.agg(["count", "sum", "max"])["max"].tolist() == a.max().tolist()
+
+        a = JaggedArray.fromcounts([3, 2, 0], MaskedArray([False, True, False, False, False], [1.0, 100.0, 3.0, 4.0, 6.0]))
+        out = a.agg(["mean", "var", "std"])
+        assert numpy.allclose(out["mean"], [2.0, 5.0, numpy.nan], equal_nan=True)
+        for n in ["mean", "var", "std"]:
+            assert numpy.allclose(out[n], getattr(a, n)(), equal_nan=True)
+
+        a = JaggedArray.fromcounts([3, 0], numpy.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]))
+        out = a.agg(["mean", "var", "std", "sum"])
+        assert numpy.allclose(out["mean"], [[3.0, 4.0], [numpy.nan, numpy.nan]], equal_nan=True)
+        for n in ["mean", "var", "std", "sum"]:
+            assert numpy.allclose(out[n], getattr(a, n)(), equal_nan=True)
+
+    def test_jagged_unique(self):
+        a = JaggedArray.fromcounts([5, 0, 3, 2], [3, 1, 3, 2, 1, 7, 7, 7, 5, 4])
+        assert a.unique().tolist() == [[1, 2, 3], [], [7], [4, 5]]
+        unique, index, counts = a.unique(return_index=True, return_counts=True)
+        assert index.tolist() == [[1, 3, 0], [], [0], [1, 0]]
+        assert counts.tolist() == [[2, 1, 2], [], [3], [1, 1]]
+        assert a[1:].unique(return_counts=True)[1].tolist() == [[], [3], [1, 1]]
+
+        a = JaggedArray.fromcounts([3], [numpy.nan, 1.0, numpy.nan])
+        assert a.unique(return_counts=True)[1].tolist() == [[1, 2]]
+
+        a = JaggedArray.fromcounts([2, 1], JaggedArray.fromcounts([3, 0, 2], [2, 1, 2, 5, 5]))
+        assert a.unique().tolist() == [[[1, 2], []], [[5]]]
+
+        a = JaggedArray.fromcounts([4, 3, 2], StringArray.fromiter(["b", "a", "b", "", "ab", "a", "a", "x", "x"]))
+        unique, counts = a.unique(return_counts=True)
+        assert unique.tolist() == [["", "a", "b"], ["a", "ab"], ["x"]]
+        assert counts.tolist() == [[1, 1, 2], [2, 1], [2]]
+
+        long = "x" * 100000
+        a = JaggedArray.fromcounts([4, 3], StringArray.fromiter([long + "y", "x", long, long + "y", long, "", long + "\x00"]))
+        unique, index, counts = a.unique(return_index=True, return_counts=True)
+        assert unique.tolist() == [["x", long, long + "y"], ["", long, long + "\x00"]]
+        assert index.tolist() == [[1, 2, 0], [1, 0, 2]]
+        assert counts.tolist() == [[1, 1, 2], [1, 1, 1]]
+
+        assert JaggedArray.fromcounts([], numpy.array([], dtype=numpy.int64)).unique().tolist() == []
+        assert JaggedArray.fromcounts([0, 0], StringArray.fromiter([])).unique().tolist() == [[], []]
+
+    def test_jagged_topk(self):
+        a = JaggedArray.fromcounts([5, 0, 1, 3], [3.3, 1.1, 5.5, 3.3, 2.2, 4.4, numpy.nan, 9.9, 0.0])
+        assert a.argtopk(2).tolist() == [[2, 0], [], [0], [1, 2]]
+        assert a.topk(2).tolist() == [[5.5, 3.3], [], [4.4], [9.9, 0.0]]
+        assert a.topk(2, largest=False).tolist() == [[1.1, 2.2], [], [4.4], [0.0, 9.9]]
+        assert a.argtopk(3, largest=False).tolist() == [[1, 4, 0], [], [0], [2, 1, 0]]
+        assert a.argtopk(0).tolist() == [[], [], [], []]
+        self.assertRaises(ValueError, lambda: a.topk(-1))
+
+        a = JaggedArray.fromcounts([3, 2], [1.0, numpy.nan, 5.0, 2.0, 3.0])
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            assert a.topk(2).tolist() == [[5.0, 1.0], [3.0, 2.0]]
+            assert a.topk(2, largest=False).tolist() == [[1.0, 5.0], [2.0, 3.0]]
+
+        numpy.random.seed(0)
+        counts = numpy.random.randint(0, 10, 1000)
+        a = JaggedArray.fromcounts(counts, numpy.random.randint(0, 100, counts.sum()))
+        assert a.topk(3).tolist() == a.sort(ascending=False)[:, :3].tolist()
+        assert a.topk(3, largest=False).tolist() == a.sort()[:, :3].tolist()
+
+        assert JaggedArray.fromcounts([], numpy.array([], dtype=numpy.float64)).topk(2).tolist() == []
+
+        a = JaggedArray.fromcounts([2, 1], JaggedArray.fromcounts([3, 0, 2], [1, 5, 3, 4, 6]))
+        assert a.topk(2).tolist() == [[[5, 3], []], [[6, 4]]]
+
+        a = JaggedArray.fromcounts([3, 1], Table(pt=[1.0, 5.0, 3.0, 2.0], eta=[0, 1, 2, 3]))
+        assert a.argtopk(2, by="pt").tolist() == [[1, 2], [0]]
+        assert a.topk(2, by="pt")["eta"].tolist() == [[1, 2], [3]]
+
     def test_jagged_min(self):
         a = JaggedArray([0, 3, 3, 5], [3, 3, 5, 10], [0.0, 1.1, 2.2, 3.3, 4.4, 5.5, 6.6, 7.7, 8.8, 9.9])
         assert a.min().tolist() == [0.0, numpy.inf, 3.3, 5.5]
@@ -28,8 +28,11 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import os
 import pickle
+import shutil
 import struct
+import tempfile
 import unittest
 import zlib
 
@@ -265,3 +268,165 @@ class Test(unittest.TestCase):
         b = deserialize(storage, whitelist="*")
         assert isinstance(b, numpy.ndarray)
         assert a.tolist() == b.tolist()
+
+    def test_lazy(self):
+        class Storage(dict):
+            def __init__(self):
+                self.reads = []
+            def __getitem__(self, where):
+                self.reads.append(where)
+                return dict.__getitem__(self, where)
+
+        a = Table(x=numpy.arange(10), y=JaggedArray.fromcounts([0, 2, 1, 3, 0, 1, 2, 0, 0, 1], numpy.arange(10.0)), z=numpy.arange(10.0) * 2)
+        storage = Storage()
+        serialize(a, storage, name="a")
+
+        storage.reads = []
+        cache = {}
+        b = deserialize(storage, name="a", lazy=True, cache=cache)
+        assert storage.reads == ["a"]
+        assert len(b) == 10
+        assert b.columns == ["x", "y", "z"]
+        assert storage.reads == ["a"]
+        assert b["y"].tolist() == a["y"].tolist()
+        assert "a-1" not in storage.reads and "a-5" not in storage.reads
+        assert len(cache) == 1
+
+        cache = {}
+        b = deserialize(storage, name="a", lazy=True, cache=cache, keyprefix="storage:")
+        assert b["y"].tolist() == a["y"].tolist()
+        assert sorted(cache) == ["storage:2"]
+
+        b = deserialize(storage, name="a", columns="z")
+        assert b.columns == ["z"]
+        assert b["z"].tolist() == a["z"].tolist()
+
+        a = ChunkedArray([numpy.arange(3), numpy.arange(4.0)])
+        storage = Storage()
+        serialize(a, storage, name="a")
+        storage.reads = []
+        b = deserialize(storage, name="a", lazy=True)
+        assert len(b) == 7
+        assert storage.reads == ["a"]
+        assert b.tolist() == a.tolist()
+
+    def test_lazy_sharedcache(self):
+        cache = {}
+        storage1, storage2 = {}, {}
+        serialize(Table(x=numpy.arange(5), y=numpy.arange(5.0)), storage1, name="a")
+        serialize(Table(x=numpy.arange(5) * 10, y=numpy.arange(5.0) * 10), storage2, name="a")
+        one = deserialize(storage1, name="a", lazy=True, cache=cache)
+        two = deserialize(storage2, name="a", lazy=True, cache=cache)
+        assert one["x"].tolist() == [0, 1, 2, 3, 4]
+        assert two["x"].tolist() == [0, 10, 20, 30, 40]
+
+        import io
+        for i in range(30):
+            f = io.BytesIO()
+            save(f, {"a": Table(x=numpy.arange(3) + i)}, mode="w")
+            assert load(io.BytesIO(f.getvalue()), lazy=True, cache=cache)["a"]["x"].tolist() == [i, i + 1, i + 2]
+
+    def test_lazy_refs(self):
+        j = JaggedArray.fromcounts([2, 1], [1.0, 2.0, 3.0])
+        storage = {}
+        serialize(Table(x=j, y=j.content), storage, name="a")
+        assert deserialize(storage, name="a", lazy=True).tolist() == deserialize(storage, name="a").tolist()
+        assert deserialize(storage, name="a", lazy=True, columns=["y"])["y"].tolist() == [1.0, 2.0, 3.0]
+        assert deserialize(storage, name="a", columns=["y"])["y"].tolist() == [1.0, 2.0, 3.0]
+
+        storage = {}
+        a = ChunkedArray([Table(x=j, y=j)] * 2)
+        serialize(a, storage, name="a")
+        assert deserialize(storage, name="a", lazy=True).tolist() == a.tolist()
+
+    def test_lazy_columns_chunked(self):
+        a = ChunkedArray([Table(x=[1, 2, 3], y=[1.1, 2.2, 3.3]), Table(x=[4, 5], y=[4.4, 5.5])])
+        storage = {}
+        serialize(a, storage, name="a")
+        cache = {}
+        b = deserialize(storage, name="a", lazy=True, columns=["y"], cache=cache, keyprefix="storage:")
+        assert b.tolist() == [{"y": 1.1}, {"y": 2.2}, {"y": 3.3}, {"y": 4.4}, {"y": 5.5}]
+        c = deserialize(storage, name="a", lazy=True, cache=cache, keyprefix="storage:")
+        assert c.tolist() == a.tolist()
+
+    def test_load_memmap(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmpdir, "test.awkd")
+            a = JaggedArray.fromcounts([3, 0, 2], numpy.arange(5.0))
+            awkward.save(filename, {"a": a, "b": numpy.arange(10000.0), "c": numpy.arange(10000)}, mode="w")
+
+            f = awkward.load(filename)
+            assert f["a"].tolist() == a.tolist()
+            b = f["b"]
+            assert b.tolist() == numpy.arange(10000.0).tolist()
+            assert not b.flags.writeable
+            base = b
+            while base.base is not None and not isinstance(base, numpy.memmap):
+                base = base.base
+            assert isinstance(base, numpy.memmap)
+            assert f["c"].tolist() == numpy.arange(10000).tolist()
+            f.close()
+            assert b.tolist() == numpy.arange(10000.0).tolist()
+
+            f = awkward.load(filename, memmap=False)
+            assert not isinstance(f["b"].base, numpy.memmap)
+            assert f["b"].tolist() == numpy.arange(10000.0).tolist()
+            f.close()
+            del f, b, base
+
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_writeiter(self):
+        class Storage(dict):
+            def writeiter(self, where, chunks, nbytes):
+                chunks = list(chunks)
+                self.chunks = getattr(self, "chunks", []) + chunks
+                self[where] = b"".join(chunks)
+
+        a = Table(x=numpy.arange(500000), y=numpy.arange(500000.0))
+        storage = Storage()
+        serialize(a, storage)
+        assert any(isinstance(x, numpy.ndarray) and x.nbytes == a["y"].nbytes for x in storage.chunks)
+        assert len([x for x in storage.chunks if isinstance(x, bytes)]) > 1
+        b = deserialize(storage)
+        assert a["x"].tolist() == b["x"].tolist()
+        assert a["y"].tolist() == b["y"].tolist()
+
+    def test_compression_codecs_filters(self):
+        import bz2
+        a = JaggedArray(numpy.arange(0, 30000, 3), numpy.arange(2, 30002, 3), numpy.arange(30002.0))
+        for policy in [bz2.compress,
+                       [{"contexts": ["JaggedArray.starts", "JaggedArray.stops"], "filters": ["delta", "shuffle"], "pair": zlib.compress},
+                        {"types": [numpy.floating], "filters": "shuffle", "pair": bz2.compress}]]:
+            storage = {}
+            serialize(a, storage, compression=policy)
+            b = deserialize(storage)
+            assert a.starts.tolist() == b.starts.tolist()
+            assert a.stops.tolist() == b.stops.tolist()
+            assert a.content.tolist() == b.content.tolist()
+
+        storage = {}
+        serialize(a.starts, storage, compression={"filters": "delta", "pair": zlib.compress})
+        assert len(storage["0"]) < len(zlib.compress(a.starts)) // 10
+        assert deserialize(storage).tolist() == a.starts.tolist()
+
+        self.assertRaises(ValueError, lambda: serialize(a, {}, compression={"filters": "nope", "pair": zlib.compress}))
+
+    def test_threads(self):
+        import bz2
+        a = Table(x=JaggedArray.fromcounts(numpy.arange(1000) % 7, numpy.arange(2997.0)), y=numpy.arange(1000) % 13, z=numpy.arange(1000.0))
+        policy = [{"types": [numpy.integer], "pair": zlib.compress, "filters": "delta"},
+                  {"types": [numpy.floating], "pair": bz2.compress}]
+        serial = {}
+        serialize(a, serial, compression=policy)
+        for threads in 1, 2, 8:
+            storage = {}
+            serialize(a, storage, compression=policy, threads=threads)
+            assert serial == storage
+            b = deserialize(storage, threads=threads)
+            assert a.tolist() == b.tolist()
+            b = deserialize(storage, columns=["x"], threads=threads)
+            assert b.columns == ["x"]
+            assert a["x"].tolist() == b["x"].tolist()
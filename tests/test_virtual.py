@@ -97,3 +97,109 @@ class Test(unittest.TestCase):
         assert not a.ismaterialized
         assert numpy.array_equal(a[:], numpy.array([1, 2, 3]))
         assert a.ismaterialized
+
+    def test_virtual_arraycache(self):
+        cache = ArrayCache(250)
+        a = [VirtualArray(lambda i: numpy.arange(10) + i, (i,), cache=cache, persistentkey="a{0}".format(i)) for i in range(5)]
+        assert a[0].tolist() == list(range(10))
+        assert a[1].tolist() == list(range(1, 11))
+        assert a[2].tolist() == list(range(2, 12))
+        assert cache.nbytes == 240 and cache.evictions == 0
+        assert a[0].tolist() == list(range(10))
+        assert a[3].tolist() == list(range(3, 13))
+        assert list(cache) == ["a2", "a0", "a3"]
+        assert cache.evictions == 1
+        assert cache.hits == 1
+        assert not a[1].ismaterialized
+        assert a[1].tolist() == list(range(1, 11))
+        assert cache.bytesloaded == 5 * 80
+        assert cache.nbytes <= 250
+
+        cache[VirtualArray.TransientKey(1)] = numpy.arange(1000)
+        assert VirtualArray.TransientKey(1) not in cache
+        del cache["a1"]
+        assert "a1" not in cache and cache.nbytes == 160
+        self.assertRaises(KeyError, lambda: cache["a1"])
+        assert cache.misses >= 1
+        cache.clear()
+        assert len(cache) == 0 and cache.nbytes == 0
+
+    def test_virtual_singleflight(self):
+        import multiprocessing.pool
+        import threading
+        import time
+
+        calls = []
+        lock = threading.Lock()
+        def generate():
+            with lock:
+                calls.append(None)
+            time.sleep(0.05)
+            return numpy.arange(1000)
+
+        pool = multiprocessing.pool.ThreadPool(32)
+        try:
+            for cache in None, {}, ArrayCache(10**6):
+                del calls[:]
+                a = VirtualArray(generate, cache=cache)
+                assert pool.map(lambda i: a[i], range(320)) == list(range(320))
+                assert len(calls) == 1
+
+            del calls[:]
+            cache = {}
+            a = [VirtualArray(generate, cache=cache, persistentkey="same") for i in range(4)]
+            assert pool.map(lambda i: a[i % 4][i], range(320)) == list(range(320))
+            assert len(calls) == 1
+            assert list(cache) == ["same"]
+
+            def fail():
+                time.sleep(0.05)
+                raise ValueError("oops")
+            a = VirtualArray(fail)
+            for x in [pool.apply_async(lambda: a[0]) for i in range(4)]:
+                self.assertRaises(ValueError, x.get)
+            assert len(VirtualArray._flights) == 0
+
+        finally:
+            pool.close()
+            pool.join()
+
+        cache = {}
+        a = VirtualArray(lambda: numpy.arange(10), cache=cache)
+        a.materialize()
+        b = a.copy()
+        assert b.tolist() == list(range(10))
+        del b
+        assert len(cache) == 1
+        del a
+        assert len(cache) == 0
+
+    def test_virtual_typecheck(self):
+        a = Table(x=JaggedArray.fromcounts([2, 0, 1], [1.1, 2.2, 3.3]), y=numpy.arange(3))
+        def generate(n):
+            return a[:n]
+
+        assert VirtualArray(generate, (3,), type=awkward.type.fromarray(a)).tolist() == a.tolist()
+        assert VirtualArray(generate, (2,), type=awkward.type.fromarray(a[:2])).tolist() == a[:2].tolist()
+        self.assertRaises(TypeError, lambda: VirtualArray(generate, (2,), type=awkward.type.fromarray(a)).materialize())
+
+        # a generator that has produced the declared type before is not trusted for the next array
+        j = JaggedArray.fromcounts([2, 0, 1], [1.1, 2.2, 3.3])
+        outputs = [j, Table(x=numpy.arange(3)), JaggedArray.fromcounts([2, 0, 1], numpy.array([1, 2, 3], dtype=numpy.int32))]
+        def generate2():
+            return outputs.pop(0)
+        assert VirtualArray(generate2, type=awkward.type.fromarray(j)).tolist() == j.tolist()
+        self.assertRaises(TypeError, lambda: VirtualArray(generate2, type=awkward.type.fromarray(j)).materialize())
+        self.assertRaises(TypeError, lambda: VirtualArray(generate2, type=awkward.type.fromarray(j)).materialize())
+        self.assertRaises(TypeError, lambda: VirtualArray(lambda: Table(x=a["x"], y=numpy.arange(3.0)), type=awkward.type.fromarray(a)).materialize())
+
+        self.assertRaises(TypeError, lambda: VirtualArray(lambda: numpy.arange(3), type=awkward.type.ArrayType(3, numpy.dtype(numpy.float64))).materialize())
+        self.assertRaises(TypeError, lambda: VirtualArray(lambda: numpy.arange(6).reshape(2, 3), type=awkward.type.ArrayType(2, 2, numpy.dtype(numpy.int64))).materialize())
+        assert VirtualArray(lambda: numpy.arange(6).reshape(2, 3), type=awkward.type.ArrayType(2, 3, numpy.dtype(numpy.int64))).tolist() == [[0, 1, 2], [3, 4, 5]]
+
+        b = Table(x=numpy.arange(3), y=numpy.arange(3))
+        VirtualArray.check_type_deep = True
+        try:
+            self.assertRaises(TypeError, lambda: VirtualArray(lambda n: b, (3,), type=awkward.type.fromarray(a)).materialize())
+        finally:
+            VirtualArray.check_type_deep = False